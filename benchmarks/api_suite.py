@@ -0,0 +1,285 @@
+"""
+Measures calls per second, latency percentiles and peak memory of common
+client workloads against the local Haas API stub.
+
+The stub runs in this process, every scenario runs in a fresh interpreter,
+so its peak RSS contains only the client:
+
+    python -m benchmarks.api_suite
+    python -m benchmarks.api_suite --json release.json
+    python -m benchmarks.api_suite --compare release.json --only markets pagination
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from haaslib import api, batch, lab
+from haaslib.api import Authenticated, Guest, RequestsExecutor
+from haaslib.domain import BacktestPeriod, MarketTag
+from haaslib.fleet import BotFleet
+from haaslib.model import CreateLabRequest
+from haaslib.parallel import BacktestPageParser
+
+from benchmarks.stub_server import StubServer
+
+Scenario = Callable[[RequestsExecutor[Authenticated], "Timer"], None]
+
+
+class Timer:
+    """
+    Collects latency of every measured call.
+    """
+
+    def __init__(self):
+        self.latencies: list[float] = []
+
+    def __call__(self, func: Callable, *args, **kwargs):
+        started_at = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - started_at)
+
+    def wrap(self, func: Callable) -> Callable:
+        return lambda *args, **kwargs: self(func, *args, **kwargs)
+
+
+def _create_labs(executor: RequestsExecutor[Authenticated], count: int) -> list[str]:
+    req = CreateLabRequest(
+        script_id="script-0",
+        name="benchmark",
+        account_id="account-0",
+        market=MarketTag("BINANCE_BTC_USDT_"),
+        interval=15,
+        default_price_data_style="CandleStick",
+    )
+    return [api.create_lab(executor, req).lab_id for _ in range(count)]
+
+
+def markets(executor: RequestsExecutor[Authenticated], timer: Timer):
+    for _ in range(50):
+        timer(api.get_all_markets, executor)
+
+
+def bots(executor: RequestsExecutor[Authenticated], timer: Timer):
+    for _ in range(50):
+        timer(api.get_all_bots, executor)
+
+
+def fleet(executor: RequestsExecutor[Authenticated], timer: Timer):
+    bot_fleet = BotFleet(executor)
+    bot_fleet.refresh()
+    for _ in range(50):
+        timer(bot_fleet.refresh)
+
+
+def lab_details(executor: RequestsExecutor[Authenticated], timer: Timer):
+    (lab_id,) = _create_labs(executor, 1)
+    for _ in range(500):
+        timer(api.get_lab_details, executor, lab_id)
+
+
+def pagination(executor: RequestsExecutor[Authenticated], timer: Timer):
+    (lab_id,) = _create_labs(executor, 1)
+    for _ in range(3):
+        timer(lambda: sum(1 for _ in lab.iter_backtest_results(executor, lab_id)))
+
+
+def pagination_summary(executor: RequestsExecutor[Authenticated], timer: Timer):
+    (lab_id,) = _create_labs(executor, 1)
+    for _ in range(3):
+        timer(
+            lambda: sum(
+                1
+                for _ in lab.iter_backtest_results(executor, lab_id, summary_only=True)
+            )
+        )
+
+
+def pagination_pool(executor: RequestsExecutor[Authenticated], timer: Timer):
+    (lab_id,) = _create_labs(executor, 1)
+    with BacktestPageParser() as parser:
+        # Starts worker processes outside of measurements
+        results = lab.iter_backtest_results(
+            executor, lab_id, summary_only=True, parser=parser
+        )
+        next(results, None)
+        results.close()
+
+        for _ in range(3):
+            timer(
+                lambda: sum(
+                    1
+                    for _ in lab.iter_backtest_results(
+                        executor, lab_id, summary_only=True, parser=parser
+                    )
+                )
+            )
+
+
+def lab_backtest(executor: RequestsExecutor[Authenticated], timer: Timer):
+    lab_ids = _create_labs(executor, 3)
+    period = BacktestPeriod(BacktestPeriod.Type.DAY, 30)
+    for lab_id in lab_ids:
+        timer(lab.backtest, executor, lab_id, period)
+
+
+def bulk_update(executor: RequestsExecutor[Authenticated], timer: Timer):
+    lab_ids = _create_labs(executor, 200)
+    details = batch.get_labs_details(executor, lab_ids).raise_for_errors()
+    batch.execute_batch(
+        timer.wrap(lambda d: api.update_lab_details(executor, d)), details
+    ).raise_for_errors()
+
+
+def bulk_delete(executor: RequestsExecutor[Authenticated], timer: Timer):
+    lab_ids = _create_labs(executor, 200)
+    batch.execute_batch(
+        timer.wrap(lambda lab_id: api.delete_lab(executor, lab_id)), lab_ids
+    ).raise_for_errors()
+
+
+SCENARIOS: dict[str, Scenario] = {
+    "markets": markets,
+    "bots": bots,
+    "fleet": fleet,
+    "lab_details": lab_details,
+    "pagination": pagination,
+    "pagination_summary": pagination_summary,
+    "pagination_pool": pagination_pool,
+    "lab_backtest": lab_backtest,
+    "bulk_update": bulk_update,
+    "bulk_delete": bulk_delete,
+}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)]
+
+
+def _peak_rss_mb() -> float:
+    # `ru_maxrss` survives `exec`, so it would report the stub process memory
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker(name: str, port: int):
+    executor = RequestsExecutor(
+        host="127.0.0.1", port=port, state=Guest()
+    ).authenticate("benchmark@example.com", "password")
+    api.prebuild_response_adapters()
+
+    timer = Timer()
+    rss_before = _peak_rss_mb()
+    started_at = time.perf_counter()
+    SCENARIOS[name](executor, timer)
+    elapsed = time.perf_counter() - started_at
+    rss_after = _peak_rss_mb()
+
+    latencies = timer.latencies
+    print(
+        json.dumps(
+            {
+                "scenario": name,
+                "calls": len(latencies),
+                "calls_per_s": len(latencies) / elapsed,
+                "p50_ms": _percentile(latencies, 0.5) * 1000,
+                "p99_ms": _percentile(latencies, 0.99) * 1000,
+                "peak_rss_mb": rss_after - rss_before,
+            }
+        )
+    )
+
+
+def _run_worker(name: str, port: int) -> dict:
+    out = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.api_suite",
+            "--worker",
+            name,
+            "--port",
+            str(port),
+        ],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def _report(results: list[dict], baseline: Optional[dict[str, dict]]):
+    header = (
+        f"{'scenario':<20}{'calls':>7}{'calls/s':>10}{'p50, ms':>10}{'p99, ms':>10}"
+    )
+    header += f"{'peak RSS, MB':>14}"
+    if baseline:
+        header += f"{'calls/s vs base':>17}"
+    print(header)
+
+    for result in results:
+        line = (
+            f"{result['scenario']:<20}{result['calls']:>7}"
+            f"{result['calls_per_s']:>10.1f}{result['p50_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}{result['peak_rss_mb']:>14.1f}"
+        )
+        base = (baseline or {}).get(result["scenario"])
+        if base:
+            change = result["calls_per_s"] / base["calls_per_s"] - 1
+            line += f"{change:>+16.1%}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=SCENARIOS, help="Scenarios to run")
+    parser.add_argument("--json", type=Path, help="Save results for comparison")
+    parser.add_argument("--compare", type=Path, help="Results of previous run")
+    parser.add_argument("--markets", type=int, default=5000)
+    parser.add_argument("--bots", type=int, default=500)
+    parser.add_argument("--backtests", type=int, default=5000)
+    parser.add_argument("--compress", action="store_true", help="Gzip responses")
+    parser.add_argument("--worker", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.port)
+        return
+
+    baseline = None
+    if args.compare:
+        baseline = {r["scenario"]: r for r in json.loads(args.compare.read_text())}
+
+    results = []
+    with StubServer(
+        markets=args.markets,
+        bots=args.bots,
+        backtests=args.backtests,
+        compression=args.compress,
+    ) as server:
+        server.prepare_pages([1000, args.backtests])
+        for name in args.only or SCENARIOS:
+            results.append(_run_worker(name, server.port))
+
+    _report(results, baseline)
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
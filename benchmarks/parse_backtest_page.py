@@ -0,0 +1,159 @@
+"""
+Compares parse time, peak and retained memory of `GET_BACKTEST_RESULT_PAGE`
+response parsing.
+
+Payload generation and every method run in a fresh interpreter,
+so peak RSS isn't shared between them. Retained memory is traced for one more
+parse while its result is still referenced:
+
+    python -m benchmarks.parse_backtest_page --count 2000
+    python -m benchmarks.parse_backtest_page --page recorded_page.json
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from haaslib import api
+from haaslib.model import (
+    PaginatedResponse,
+    UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
+)
+
+from benchmarks import payloads
+
+METHODS = (
+    "json+validate_python",
+    "pydantic",
+    "orjson",
+    "auto",
+    "summary",
+)
+"""Previous `resp.json()` parsing, all `JsonBackend` options and summary-only mode"""
+
+BASELINE = "json+validate_python"
+"""Parsing before `parse_api_response`, other methods are compared with it"""
+
+
+def parse(method: str, content: bytes):
+    response_type = PaginatedResponse[UserLabBacktestResult]
+    match method:
+        case "json+validate_python":
+            return api.response_adapter(response_type).validate_python(
+                json.loads(content)
+            )
+        case "pydantic" | "orjson" | "auto":
+            return api.parse_api_response(response_type, content, method)
+        case "summary":
+            return api.parse_api_response(
+                PaginatedResponse[UserLabBacktestSummaryResult], content
+            )
+
+    raise ValueError(f"Unknown method: {method}")
+
+
+def generate(path: Path, count: int):
+    page = payloads.backtest_page(count)
+    path.write_bytes(json.dumps(payloads.api_response(page)).encode())
+
+
+def worker(method: str, path: Path, repeat: int):
+    content = path.read_bytes()
+    api.prebuild_response_adapters()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        result = parse(method, content)
+        timings.append(time.perf_counter() - started_at)
+        del result
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    result = parse(method, content)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    print(
+        json.dumps(
+            {
+                "method": method,
+                "best_s": min(timings),
+                "peak_rss_mb": (rss_after - rss_before) / 1024,
+                "retained_mb": retained / 1024 / 1024,
+            }
+        )
+    )
+
+
+def _run(*args: str) -> str:
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.parse_backtest_page", *args],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return out.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--page", type=Path, help="Recorded raw API response")
+    parser.add_argument("--count", type=int, default=2000, help="Synthetic page size")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", choices=METHODS, help=argparse.SUPPRESS)
+    parser.add_argument("--generate", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.generate:
+        generate(args.page, args.count)
+        return
+
+    if args.worker:
+        worker(args.worker, args.page, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.page
+        if path is None:
+            path = Path(tmp) / "page.json"
+            _run("--generate", "--page", str(path), "--count", str(args.count))
+
+        print(f"Page: {path.stat().st_size / 1024 / 1024:.1f} MB")
+        print(f"{'method':<24}{'best, s':>10}{'peak RSS, MB':>16}{'retained, MB':>16}")
+        results = {}
+        for method in METHODS:
+            if method.startswith("orjson") and api.orjson is None:
+                continue
+
+            out = _run(
+                "--worker", method, "--page", str(path), "--repeat", str(args.repeat)
+            )
+            result = results[method] = json.loads(out)
+            print(
+                f"{method:<24}{result['best_s']:>10.3f}"
+                f"{result['peak_rss_mb']:>16.1f}{result['retained_mb']:>16.1f}"
+            )
+
+        before = results[BASELINE]
+        print(f"\nDefault `{api.DEFAULT_JSON_BACKEND}` backend vs {BASELINE}:")
+        for method in (api.DEFAULT_JSON_BACKEND, "summary"):
+            after = results[method]
+            print(
+                f"{method:<24}{before['best_s'] / after['best_s']:>9.2f}x"
+                f"{after['peak_rss_mb'] - before['peak_rss_mb']:>+16.1f}"
+                f"{after['retained_mb'] - before['retained_mb']:>+16.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
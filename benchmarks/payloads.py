@@ -0,0 +1,275 @@
+"""
+Synthetic Haas API payloads with realistic shapes and sizes.
+"""
+
+import random
+from typing import Any
+
+PRICE_SOURCES = ["BINANCE", "BINANCEFUTURES", "BYBIT", "KRAKEN", "OKX", "BITGET"]
+CATEGORIES = ["SPOT", "PERPETUAL", "QUARTERLY"]
+SECONDARIES = ["USDT", "USDC", "BTC", "ETH", "EUR"]
+
+
+def api_response(data: Any, success: bool = True, error: str = "") -> dict:
+    return {"Success": success, "Error": error, "Data": data}
+
+
+def market(idx: int) -> dict:
+    return {
+        "C": CATEGORIES[idx % len(CATEGORIES)],
+        "PS": PRICE_SOURCES[idx % len(PRICE_SOURCES)],
+        "P": f"COIN{idx}",
+        "S": SECONDARIES[idx % len(SECONDARIES)],
+    }
+
+
+def markets(count: int) -> list[dict]:
+    return [market(idx) for idx in range(count)]
+
+
+def settings(market_tag: str) -> dict:
+    return {
+        "botId": "",
+        "botName": "",
+        "accountId": "account-0",
+        "marketTag": market_tag,
+        "positionMode": 0,
+        "marginMode": 0,
+        "leverage": 0.0,
+        "tradeAmount": 100.0,
+        "interval": 15,
+        "chartStyle": 301,
+        "orderTemplate": 500,
+        "scriptParameters": {},
+    }
+
+
+def lab_parameters(count: int = 20) -> list[dict]:
+    return [
+        {
+            "K": f"{idx}-{idx}-10-20.Parameter {idx}",
+            "T": 0,
+            "O": [str(v) for v in range(1, 6)],
+            "I": True,
+            "IS": False,
+        }
+        for idx in range(count)
+    ]
+
+
+def lab_details(lab_id: str, status: int = 3, params: int = 20) -> dict:
+    return {
+        "C": {"MP": 50, "MG": 100, "ME": 3, "MR": 40.0, "AR": 25.0},
+        "ST": settings("BINANCE_BTC_USDT_"),
+        "P": lab_parameters(params),
+        "UID": "user-0",
+        "LID": lab_id,
+        "SID": "script-0",
+        "N": f"Lab {lab_id}",
+        "T": 1,
+        "S": status,
+        "SB": 100,
+        "CB": 100 if status == 3 else 0,
+        "CA": 1_700_000_000,
+        "UA": 1_700_000_000,
+        "SA": 1_700_000_000,
+        "RS": 1_700_000_000,
+        "SU": 1_700_000_000,
+        "EU": 1_700_100_000,
+        "SE": False,
+        "CM": "",
+    }
+
+
+def lab_record(lab_id: str, scheduled: int = 100, completed: int = 100) -> dict:
+    return {
+        "UID": "user-0",
+        "LID": lab_id,
+        "SID": "script-0",
+        "N": f"Lab {lab_id}",
+        "SB": scheduled,
+        "CB": completed,
+        "CA": 1_700_000_000,
+        "UA": 1_700_000_000,
+        "SA": 1_700_000_000,
+        "RS": 1_700_000_000,
+        "SU": 1_700_000_000,
+        "EU": 1_700_100_000,
+        "SE": False,
+        "CM": "",
+    }
+
+
+def backtest_result(idx: int, lab_id: str, heavy_points: int = 200) -> dict:
+    """
+    Single backtest record, `heavy_points` controls size of runtime, chart and logs
+    """
+    rnd = random.Random(idx)
+    return {
+        "RID": idx,
+        "UID": "user-0",
+        "LID": lab_id,
+        "BID": f"{lab_id}-backtest-{idx}",
+        "NG": idx // 50,
+        "NP": idx % 50,
+        "ST": 3,
+        "SE": settings("BINANCE_BTC_USDT_"),
+        "P": {
+            f"{p}-{p}-10-20.Parameter {p}": str(rnd.randint(1, 5)) for p in range(20)
+        },
+        "RT": {
+            "Trades": [
+                {"ID": f"t{t}", "P": rnd.random() * 100, "A": rnd.random()}
+                for t in range(heavy_points // 4)
+            ],
+            "Balance": {"USDT": rnd.random() * 10_000},
+        },
+        "C": {
+            "Charts": [
+                [1_700_000_000 + t * 60, rnd.random() * 100]
+                for t in range(heavy_points)
+            ]
+        },
+        "L": [
+            f"{t} Position opened at {rnd.random():.6f}"
+            for t in range(heavy_points // 4)
+        ],
+        "S": {
+            "O": rnd.randint(0, 500),
+            "T": rnd.randint(0, 500),
+            "P": rnd.randint(0, 250),
+            "FC": {"USDT": rnd.random() * 10},
+            "RP": {"USDT": rnd.uniform(-500, 500)},
+            "ROI": [rnd.uniform(-50, 50)],
+            "CR": {"Custom Report": None},
+        },
+    }
+
+
+def backtest_page(
+    count: int,
+    lab_id: str = "lab-0",
+    next_page_id: int = -1,
+    offset: int = 0,
+    heavy_points: int = 200,
+) -> dict:
+    return {
+        "I": [
+            backtest_result(offset + idx, lab_id, heavy_points) for idx in range(count)
+        ],
+        "NP": next_page_id,
+    }
+
+
+def bot(idx: int, update_counter: int = 0) -> dict:
+    return {
+        "UI": "user-0",
+        "ID": f"bot-{idx}",
+        "BN": f"Bot {idx}",
+        "SI": "script-0",
+        "SV": 1,
+        "AI": "account-0",
+        "PM": "BINANCE_BTC_USDT_",
+        "EI": "",
+        "IA": True,
+        "IP": False,
+        "IF": False,
+        "NO": "",
+        "SN": "",
+        "NT": 0,
+        "RP": 0.0,
+        "UP": 0.0,
+        "ROI": 0.0,
+        "TAE": False,
+        "AE": False,
+        "SE": False,
+        "UC": update_counter,
+        "CI": 15,
+        "CS": 301,
+        "CV": False,
+        "IWL": False,
+        "MBID": "",
+        "F": 0,
+    }
+
+
+def bots(count: int) -> list[dict]:
+    return [bot(idx) for idx in range(count)]
+
+
+def account(idx: int) -> dict:
+    return {
+        "UID": "user-0",
+        "AID": f"account-{idx}",
+        "N": f"Account {idx}",
+        "EC": "BINANCE",
+        "ET": 0,
+        "S": 0,
+        "IS": True,
+        "IT": False,
+        "PA": False,
+        "WL": False,
+        "PM": 0,
+        "MS": None,
+        "V": 1,
+    }
+
+
+def script(idx: int, updated_unix: int = 1_700_000_000) -> dict:
+    return {
+        "D": [],
+        "UID": "user-0",
+        "SID": f"script-{idx}",
+        "SN": f"Script {idx}",
+        "SD": "",
+        "ST": 0,
+        "SS": 0,
+        "CN": "",
+        "IC": False,
+        "IV": True,
+        "CU": 1_700_000_000,
+        "UU": updated_unix,
+        "FID": 0,
+    }
+
+
+def session(user_id: str = "user-0") -> dict:
+    """
+    `LOGIN_WITH_ONE_TIME_CODE` response data
+    """
+    return {
+        "D": {
+            "UserId": user_id,
+            "Username": None,
+            "InterfaceSecret": "secret",
+            "UserRights": 1,
+            "IsAffiliate": False,
+            "IsProductSeller": False,
+            "SupportHash": None,
+            "LicenseDetails": {
+                "Generated": 1_700_000_000,
+                "LicenseName": "Enterprise",
+                "ValidUntill": 1_800_000_000,
+                "Rights": 1,
+                "Enterprise": True,
+                "AllowedExchanges": [],
+                "MaxBots": 1000,
+                "MaxSimulatedAccounts": 100,
+                "MaxRealAccounts": 100,
+                "MaxDashboards": 10,
+                "MaxBacktestMonths": 36,
+                "MaxLabsMonths": 36,
+                "MaxOpenOrders": 1000,
+                "RentedSignals": {},
+                "RentedStrategies": {},
+                "HireSignalsEnabled": False,
+                "HireStrategiesEnabled": False,
+                "HaasLabsEnabled": True,
+                "ResellSignalsEnabled": False,
+                "MarketDetailsEnabled": True,
+                "LocalAPIEnabled": True,
+                "ScriptedExchangesEnabled": False,
+                "MachinelearningEnabled": False,
+            },
+        }
+    }
@@ -0,0 +1,119 @@
+"""
+Measures per-call client overhead of `RequestsExecutor.execute` without network.
+
+Session returns prebuilt response instantly, so timings contain only
+parameters encoding, logging, URL building and response parsing:
+
+    python -m benchmarks.request_overhead
+    python -m benchmarks.request_overhead --debug-log
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import requests
+
+from haaslib import api
+from haaslib.api import Authenticated, RequestsExecutor
+from haaslib.channels import LARGE_PARAMS_CHANNELS
+from haaslib.logger import log
+from haaslib.model import UserLabDetails
+
+from benchmarks import payloads
+
+
+class _OfflineSession(requests.Session):
+    def __init__(self, body: bytes):
+        super().__init__()
+        self.body = body
+
+    def request(self, method, url, params=None, data=None, headers=None, **kwargs):
+        # Requests encodes params while preparing the request, keep that cost
+        prepared = requests.Request(
+            method, url, params=params, data=data, headers=headers
+        ).prepare()
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = prepared.url or url
+        resp._content = self.body
+        return resp
+
+
+def _executor(
+    body: bytes, post_channels: frozenset[str] = frozenset()
+) -> RequestsExecutor[Authenticated]:
+    return RequestsExecutor(
+        host="127.0.0.1",
+        port=8090,
+        state=Authenticated(user_id="user-0", interface_key="1234567890"),
+        session=_OfflineSession(body),
+        post_channels=post_channels,
+    )
+
+
+def measure(name: str, call, repeat: int):
+    call()
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        call()
+    per_call = (time.perf_counter() - started_at) / repeat
+    print(f"{name:<32}{per_call * 1e6:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5000)
+    parser.add_argument("--params", type=int, default=50, help="Lab parameters")
+    parser.add_argument(
+        "--debug-log", action="store_true", help="Keep DEBUG logging enabled"
+    )
+    args = parser.parse_args()
+
+    log.remove()
+    if args.debug_log:
+        log.add(lambda _: None, level="DEBUG")
+    else:
+        log.add(sys.stderr, level="INFO")
+
+    details = UserLabDetails.model_validate(
+        payloads.lab_details("lab-0", params=args.params)
+    )
+    details_body = json.dumps(
+        payloads.api_response(payloads.lab_details("lab-0"))
+    ).encode()
+    bool_body = json.dumps(payloads.api_response(True)).encode()
+
+    print(f"{'call':<32}{'us/call':>10}")
+    executor = _executor(bool_body)
+    measure("DELETE_LAB", lambda: api.delete_lab(executor, "lab-0"), args.repeat)
+
+    executor = _executor(details_body)
+    measure(
+        "GET_LAB_DETAILS",
+        lambda: api.get_lab_details(executor, "lab-0"),
+        args.repeat,
+    )
+    measure(
+        f"UPDATE_LAB_DETAILS ({args.params} params)",
+        lambda: api.update_lab_details(executor, details),
+        args.repeat,
+    )
+    post_executor = _executor(details_body, LARGE_PARAMS_CHANNELS)
+    measure(
+        f"UPDATE_LAB_DETAILS POST ({args.params})",
+        lambda: api.update_lab_details(post_executor, details),
+        args.repeat,
+    )
+    measure(
+        "encode_query_params",
+        lambda: api.encode_query_params(
+            {"channel": "UPDATE_LAB_DETAILS", "parameters": details.parameters}
+        ),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
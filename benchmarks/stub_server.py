@@ -0,0 +1,273 @@
+"""
+In-process Haas API stub serving synthetic payloads from `benchmarks.payloads`.
+
+Implements channels used by `haaslib.api`, labs finish as soon as they are
+started. Static responses and backtest pages are encoded once, so the stub
+costs as little as possible compared to the client being measured:
+
+    with StubServer(markets=5000, bots=500) as server:
+        executor = RequestsExecutor(host=server.host, port=server.port, state=Guest())
+"""
+
+import gzip
+import itertools
+import json
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks import payloads
+
+ENDPOINTS = ("Labs", "Account", "HaasScript", "Price", "User", "Bot")
+
+
+def _encode(data: Any, success: bool = True, error: str = "") -> bytes:
+    return json.dumps(payloads.api_response(data, success, error)).encode()
+
+
+class StubServer:
+    """
+    Threaded HTTP server answering like Haas API.
+    """
+
+    def __init__(
+        self,
+        markets: int = 5000,
+        bots: int = 500,
+        accounts: int = 20,
+        scripts: int = 200,
+        backtests: int = 5000,
+        heavy_points: int = 200,
+        compression: bool = False,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        :param markets: Size of `MARKETLIST` response
+        :param bots: Size of `GET_BOTS` response
+        :param accounts: Size of `GET_ACCOUNTS` response
+        :param scripts: Size of `GET_ALL_SCRIPT_ITEMS` response
+        :param backtests: Backtests of every lab
+        :param heavy_points: Runtime and chart points per backtest
+        :param compression: Gzip responses for clients accepting it
+        :param host: Interface to listen on
+        :param port: Port to listen on, random free one if 0
+        """
+        self.backtests = backtests
+        self.heavy_points = heavy_points
+        self.compression = compression
+        self.requests: Counter[str] = Counter()
+        """Served requests by channel"""
+        self.resets: Counter[str] = Counter()
+        """Pending connection resets by channel, each cuts the next response body"""
+
+        self._static = {
+            "LOGIN_WITH_CREDENTIALS": _encode({}),
+            "LOGIN_WITH_ONE_TIME_CODE": _encode(payloads.session()),
+            "MARKETLIST": _encode(payloads.markets(markets)),
+            "GET_BOTS": _encode(payloads.bots(bots)),
+            "GET_ACCOUNTS": _encode([payloads.account(i) for i in range(accounts)]),
+            "GET_ALL_SCRIPT_ITEMS": _encode(
+                [payloads.script(i) for i in range(scripts)]
+            ),
+        }
+        self._pages: dict[tuple[int, int], bytes] = {}
+        self._compressed: dict[bytes, bytes] = {}
+        self._labs: dict[str, int] = {}
+        """Lab status by lab id"""
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+        handler = type("Handler", (_Handler,), {"stub": self})
+        self._httpd = ThreadingHTTPServer((host, port), handler)
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def host(self) -> str:
+        return str(self._httpd.server_address[0])
+
+    @property
+    def port(self) -> int:
+        return int(self._httpd.server_address[1])
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_labs(self, count: int, status: int = 3) -> list[str]:
+        """
+        Creates labs without requests, e.g. for bulk operations
+
+        :param count: Amount of labs
+        :param status: Initial status of labs
+        """
+        with self._lock:
+            lab_ids = [f"lab-{next(self._ids)}" for _ in range(count)]
+            self._labs.update((lab_id, status) for lab_id in lab_ids)
+        return lab_ids
+
+    def respond(self, endpoint: str, params: dict[str, str]) -> bytes:
+        """
+        Builds raw response body for the request
+        """
+        channel = params.get("channel", "")
+        self.requests[channel] += 1
+
+        if channel in self._static:
+            return self._static[channel]
+
+        lab_id = params.get("labid", "")
+        match channel:
+            case "CREATE_LAB":
+                (lab_id,) = self.add_labs(1, status=0)
+                return _encode(payloads.lab_details(lab_id, status=0))
+            case "START_LAB_EXECUTION" if lab_id in self._labs:
+                self._labs[lab_id] = 3
+                return _encode(payloads.lab_details(lab_id, status=2))
+            case "GET_LAB_DETAILS" | "UPDATE_LAB_DETAILS" if lab_id in self._labs:
+                return _encode(payloads.lab_details(lab_id, self._labs[lab_id]))
+            case "GET_LABS":
+                with self._lock:
+                    labs = list(self._labs.items())
+                return _encode(
+                    [
+                        {**payloads.lab_record(lab_id), "S": status}
+                        for lab_id, status in labs
+                    ]
+                )
+            case "GET_BACKTEST_RESULT_PAGE" if lab_id in self._labs:
+                return self._page(
+                    int(params.get("nextpageid", 0)),
+                    int(params.get("pagelength", 100)),
+                )
+            case "DELETE_LAB" if lab_id in self._labs:
+                with self._lock:
+                    self._labs.pop(lab_id, None)
+                return _encode(True)
+            case "ADD_BOT" | "ADD_BOT_FROM_LABS":
+                return _encode(payloads.bot(next(self._ids)))
+            case "DELETE_BOT":
+                return _encode(params.get("botid", ""))
+
+        return _encode(None, success=False, error=f"Unknown request: {channel}")
+
+    def take_reset(self, params: dict[str, str]) -> bool:
+        """
+        Checks if the response should be cut as if connection was reset
+        """
+        channel = params.get("channel", "")
+        with self._lock:
+            if self.resets[channel] <= 0:
+                return False
+            self.resets[channel] -= 1
+            return True
+
+    def prepare_pages(self, page_sizes: Iterable[int]):
+        """
+        Encodes backtest pages in advance, so the first pagination isn't slower
+
+        :param page_sizes: Page lengths clients will request
+        """
+        for page_size in page_sizes:
+            for offset in range(0, self.backtests, page_size):
+                self._page(offset, page_size)
+
+    def compress(self, body: bytes) -> bytes:
+        """
+        Returns gzipped body, cached for static responses and pages
+        """
+        compressed = self._compressed.get(body)
+        if compressed is None:
+            compressed = gzip.compress(body, compresslevel=6)
+            if len(body) > 64 * 1024:
+                self._compressed[body] = compressed
+        return compressed
+
+    def _page(self, offset: int, length: int) -> bytes:
+        length = max(min(length, self.backtests - offset), 0)
+        key = (offset, length)
+        page = self._pages.get(key)
+        if page is None:
+            next_page_id = offset + length if offset + length < self.backtests else -1
+            page = self._pages[key] = _encode(
+                payloads.backtest_page(
+                    length,
+                    next_page_id=next_page_id,
+                    offset=offset,
+                    heavy_points=self.heavy_points,
+                )
+            )
+        return page
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    stub: StubServer
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/").removesuffix("API.php")
+        if endpoint not in ENDPOINTS:
+            self.send_error(404)
+            return
+
+        params = dict(parse_qsl(url.query))
+        self._send(self.stub.respond(endpoint, params), self.stub.take_reset(params))
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.strip("/").removesuffix("API.php")
+        if endpoint not in ENDPOINTS:
+            self.send_error(404)
+            return
+
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+
+        params = dict(parse_qsl(url.query))
+        if self.headers.get("Content-Type") == "application/json":
+            params.update(
+                (k, v if isinstance(v, str) else json.dumps(v))
+                for k, v in json.loads(body).items()
+            )
+        else:
+            params.update(parse_qsl(body.decode()))
+
+        self._send(self.stub.respond(endpoint, params), self.stub.take_reset(params))
+
+    def _send(self, body: bytes, reset: bool = False):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if (
+            self.stub.compression
+            and len(body) > 1024
+            and "gzip" in self.headers.get("Accept-Encoding", "")
+        ):
+            body = self.stub.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if reset:
+            self.wfile.write(body[: len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
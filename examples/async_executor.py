@@ -0,0 +1,54 @@
+import asyncio
+import random
+
+from haaslib import async_api, async_lab
+from haaslib.domain import BacktestPeriod
+from haaslib.model import CreateLabRequest
+
+
+async def main():
+    async with async_api.AiohttpExecutor(
+        host="127.0.0.1", port=8090, state=async_api.Guest()
+    ) as guest:
+        executor = await guest.authenticate(
+            email="admin@admin.com", password="adm2inadm4in!"
+        )
+
+        markets, accounts, scripts = await asyncio.gather(
+            async_api.get_all_markets(executor),
+            async_api.get_accounts(executor),
+            async_api.get_all_scripts(executor),
+        )
+        account = random.choice(accounts)
+        script = random.choice(scripts)
+
+        # Create several labs at once
+        labs = await asyncio.gather(
+            *(
+                async_api.create_lab(
+                    executor,
+                    CreateLabRequest(
+                        script_id=script.script_id,
+                        name=f"Async lab {idx}",
+                        account_id=account.account_id,
+                        market=market.as_market_tag(),
+                        interval=0,
+                        default_price_data_style="CandleStick",
+                    ),
+                )
+                for idx, market in enumerate(random.sample(markets, 5))
+            )
+        )
+        print(f"Created {len(labs)} labs")
+
+        # Backtest all of them concurrently
+        period = BacktestPeriod(period_type=BacktestPeriod.Type.DAY, count=20)
+        results = await asyncio.gather(
+            *(async_lab.backtest(executor, lab.lab_id, period) for lab in labs)
+        )
+        for lab, result in zip(labs, results):
+            print(f"{lab.name}: {len(result.items)} backtests")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,4 @@
-from haaslib import api
+from haaslib import api, batch
 
 
 def main():
@@ -8,10 +8,11 @@ def main():
     all_labs = api.get_all_labs(executor)
     print(f"Deleting {len(all_labs)} labs")
 
-    for lab in all_labs:
-        api.delete_lab(executor, lab.lab_id)
+    result = batch.delete_labs(executor, [lab.lab_id for lab in all_labs])
+    for failure in result.failures:
+        print(f"Failed to delete {failure.item}: {failure.error}")
 
-    print("All labs deleted")
+    print(f"{len(result.values)} labs deleted")
 
 
 if __name__ == "__main__":
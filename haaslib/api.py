@@ -1,28 +1,46 @@
 from __future__ import annotations
 
-import copy
 import dataclasses
+import functools
+import gzip
+import importlib.util
 import json
 import random
+import re
+import time
 from typing import (
     Any,
+    Callable,
     Collection,
     Generic,
+    Hashable,
     Iterable,
     Literal,
     Optional,
     Protocol,
+    TYPE_CHECKING,
+    Self,
     Type,
     TypeVar,
     cast,
+    overload,
 )
+from urllib.parse import urlencode
 
+import pydantic_core
 import requests
+import requests.adapters
 from pydantic import BaseModel, TypeAdapter, ValidationError
-from pydantic.json import pydantic_encoder
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from haaslib.channels import RequestMethod, get_channel
 from haaslib.domain import HaaslibExcpetion
 from haaslib.logger import log
+from haaslib.metrics import MetricsHook, RequestObservation
 from haaslib.model import (
     AddBotFromLabRequest,
     ApiResponse,
@@ -34,13 +52,21 @@ from haaslib.model import (
     HaasBot,
     HaasScriptItemWithDependencies,
     PaginatedResponse,
+    RawBacktestItem,
     StartLabExecutionRequest,
     UserAccount,
     UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
     UserLabDetails,
     UserLabRecord,
 )
 
+if TYPE_CHECKING:
+    from haaslib.parallel import BacktestPageParser
+
+_lazy_log = log.opt(lazy=True)
+"""Logger which formats messages only if some handler accepts them"""
+
 ApiResponseData = TypeVar(
     "ApiResponseData", bound=BaseModel | Collection[BaseModel] | bool | str
 )
@@ -49,6 +75,42 @@ ApiResponseData = TypeVar(
 HaasApiEndpoint = Literal["Labs", "Account", "HaasScript", "Price", "User", "Bot"]
 """Known Haas API endpoints"""
 
+JsonBackend = Literal["auto", "pydantic", "orjson"]
+"""
+How responses are parsed:
+`pydantic` validates raw bytes in a single pass without intermediate objects,
+`orjson` decodes them with `orjson` first, which is faster,
+`auto` uses `orjson` if it's installed.
+Summary-only backtest pages are decoded backtest by backtest with any backend.
+"""
+
+DEFAULT_JSON_BACKEND: JsonBackend = "auto"
+
+_BACKTEST_SUMMARY_PAGE = PaginatedResponse[UserLabBacktestSummaryResult]
+
+_JSON_DECODER = json.JSONDecoder()
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+ACCEPT_ENCODING = ", ".join(
+    [
+        "gzip",
+        "deflate",
+        *(
+            ["br"]
+            if importlib.util.find_spec("brotli")
+            or importlib.util.find_spec("brotlicffi")
+            else []
+        ),
+    ]
+)
+"""Response encodings decoded by both HTTP clients, brotli requires `brotli` package"""
+
+BodyCompression = Literal["gzip"]
+"""Supported compression of POST bodies"""
+
+URL_PARAMS = ("channel", "userid", "interfacekey")
+"""Parameters which stay in URL of POST requests"""
+
 
 class HaasApiError(HaaslibExcpetion):
     """
@@ -89,6 +151,47 @@ State = TypeVar("State", bound=Guest | Authenticated)
 """Generic to mark user session typ"""
 
 
+def generate_interface_key() -> str:
+    """
+    Generates random interface key identifying client session
+    """
+    return "".join(f"{random.randint(0, 100)}" for _ in range(10))
+
+
+@dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
+class ConnectionPoolConfig:
+    """HTTP connection pool settings of an executor."""
+
+    pool_connections: int = 10
+    """Number of per-host connection pools to cache."""
+
+    pool_maxsize: int = 10
+    """Maximum number of connections kept alive per host."""
+
+    pool_block: bool = False
+    """Wait for a free connection instead of opening extra one when pool is full."""
+
+    keep_alive: bool = True
+    """Reuse connections between requests (disable to close them after each one)."""
+
+    def create_session(self) -> requests.Session:
+        """
+        Creates `requests` session with the pool configured by this settings
+        """
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+        )
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        if not self.keep_alive:
+            session.headers["Connection"] = "close"
+
+        return session
+
+
 class SyncExecutor(Protocol, Generic[State]):
     """
     Main protocol for interaction with HaasAPI.
@@ -112,6 +215,25 @@ class SyncExecutor(Protocol, Generic[State]):
         ...
 
 
+class RawExecutor(SyncExecutor[State], Protocol):
+    """
+    Executor which could also return unparsed responses,
+    e.g. to parse them in another process.
+    """
+
+    def execute_raw(
+        self, endpoint: HaasApiEndpoint, query_params: Optional[dict] = None
+    ) -> bytes:
+        """
+        Executes any request to Haas API without parsing its response
+
+        :param endpoint: Actual Haas API endpoint
+        :param query_params: Endpoint parameters
+        :return: Raw response body, which could be parsed with `parse_api_response`
+        """
+        ...
+
+
 @dataclasses.dataclass(kw_only=True, frozen=True, slots=True)
 class RequestsExecutor(Generic[State]):
     """First implementation of `SyncExecutor` based on `requests` library."""
@@ -128,6 +250,54 @@ class RequestsExecutor(Generic[State]):
     protocol: Literal["http"] = dataclasses.field(default="http")
     """Communication protocol (currently only http is valid)."""
 
+    pool: ConnectionPoolConfig = dataclasses.field(default_factory=ConnectionPoolConfig)
+    """Connection pool settings, used only when `session` isn't provided."""
+
+    session: Optional[requests.Session] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+    """Pooled HTTP session shared by all executors derived from this one."""
+
+    json_backend: JsonBackend = dataclasses.field(default=DEFAULT_JSON_BACKEND)
+    """Parser used for responses deserialization."""
+
+    metrics: Optional[MetricsHook] = dataclasses.field(default=None, compare=False)
+    """Receiver of per request measurements, nothing is measured if not given."""
+
+    post_channels: frozenset[str] = frozenset()
+    """
+    Channels sent as POST with parameters in the body, server must read them
+    from there, e.g. `channels.LARGE_PARAMS_CHANNELS`.
+    """
+
+    body_compression: Optional[BodyCompression] = None
+    """Compression of POST bodies, server must accept `Content-Encoding` for it."""
+
+    accept_encoding: str = ACCEPT_ENCODING
+    """Response encodings offered to the server, used only when `session` isn't provided."""
+
+    def __post_init__(self):
+        if self.session is None:
+            session = self.pool.create_session()
+            session.headers["Accept-Encoding"] = self.accept_encoding
+            object.__setattr__(self, "session", session)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Releases pooled connections.
+
+        Session is shared with the executor returned from `authenticate`,
+        so closing any of them closes both.
+        """
+        assert self.session is not None
+        self.session.close()
+
     def authenticate(
         self: RequestsExecutor[Guest], email: str, password: str
     ) -> RequestsExecutor[Authenticated]:
@@ -138,7 +308,7 @@ class RequestsExecutor(Generic[State]):
         :param password: Password used to login into Web UI
         :raises HaasApiError: If credentials are incorrect
         """
-        interface_key = "".join(f"{random.randint(0, 100)}" for _ in range(10))
+        interface_key = generate_interface_key()
         resp = self._execute_inner(
             "User",
             response_type=dict,
@@ -171,8 +341,8 @@ class RequestsExecutor(Generic[State]):
             interface_key=interface_key, user_id=resp.data.data.user_id
         )
 
-        return RequestsExecutor(
-            host=self.host, port=self.port, state=state, protocol=self.protocol
+        return cast(
+            RequestsExecutor[Authenticated], dataclasses.replace(self, state=state)
         )
 
     def execute(
@@ -202,25 +372,7 @@ class RequestsExecutor(Generic[State]):
             case _:
                 raise ValueError(f"Unknown auth state: {self.state}")
 
-        if not resp.success:
-            if query_params:
-                req = {
-                    k: v
-                    for k, v in query_params.items()
-                    if k not in ("userid", "interfacekey")
-                }
-            else:
-                req = None
-
-            msg = resp.error or "[No response]"
-
-            raise HaasApiError(
-                f"Failed to request {endpoint}API with {msg}. Input params: {req}"
-            )
-
-        assert resp.data is not None
-
-        return resp.data
+        return unwrap_api_response(endpoint, resp, query_params)
 
     def _execute_authenticated(
         self: RequestsExecutor[Authenticated],
@@ -228,13 +380,11 @@ class RequestsExecutor(Generic[State]):
         response_type: Type[ApiResponseData],
         query_params: Optional[dict] = None,
     ) -> ApiResponse[ApiResponseData]:
-        if query_params is None:
-            query_params = {}
-        else:
-            query_params = copy.deepcopy(query_params)
-
-        query_params["userid"] = self.state.user_id
-        query_params["interfacekey"] = self.state.interface_key
+        query_params = {
+            **(query_params or {}),
+            "userid": self.state.user_id,
+            "interfacekey": self.state.interface_key,
+        }
 
         return self._execute_inner(endpoint, response_type, query_params)
 
@@ -246,53 +396,464 @@ class RequestsExecutor(Generic[State]):
     ) -> ApiResponse[ApiResponseData]:
         return self._execute_inner(endpoint, response_type, query_params)
 
+    def execute_raw(
+        self, endpoint: HaasApiEndpoint, query_params: Optional[dict] = None
+    ) -> bytes:
+        """
+        Executes any request to Haas API without parsing its response
+
+        :param endpoint: Actual Haas API endpoint
+        :param query_params: Endpoint parameters
+        :return: Raw response body, which could be parsed with `parse_api_response`
+        """
+        if isinstance(self.state, Authenticated):
+            query_params = {
+                **(query_params or {}),
+                "userid": self.state.user_id,
+                "interfacekey": self.state.interface_key,
+            }
+
+        if self.metrics is None:
+            return self._fetch(endpoint, query_params)
+
+        channel = query_params.get("channel") if query_params else None
+        observation = RequestObservation(endpoint, channel)
+        try:
+            return self._fetch(endpoint, query_params, observation)
+        except Exception as e:
+            observation.error = e.__class__.__name__
+            raise
+        finally:
+            self.metrics.observe(observation)
+
     def _execute_inner(
         self,
         endpoint: HaasApiEndpoint,
         response_type: Type[ApiResponseData],
         query_params: Optional[dict] = None,
     ) -> ApiResponse[ApiResponseData]:
+        if self.metrics is None:
+            content = self._fetch(endpoint, query_params)
+            return parse_api_response(response_type, content, self.json_backend)
+
+        channel = query_params.get("channel") if query_params else None
+        observation = RequestObservation(endpoint, channel)
+        try:
+            content = self._fetch(endpoint, query_params, observation)
+            return parse_api_response(
+                response_type, content, self.json_backend, observation
+            )
+        except Exception as e:
+            observation.error = e.__class__.__name__
+            raise
+        finally:
+            self.metrics.observe(observation)
+
+    def _fetch(
+        self,
+        endpoint: HaasApiEndpoint,
+        query_params: Optional[dict] = None,
+        observation: Optional[RequestObservation] = None,
+    ) -> bytes:
         url = f"{self.protocol}://{self.host}:{self.port}/{endpoint}API.php"
-        log.debug(
-            f"[{self.state.__class__.__name__}]: Requesting {url=} with {query_params=}"
+        _lazy_log.debug(
+            "[{}]: Requesting url={} with query_params={}",
+            lambda: self.state.__class__.__name__,
+            lambda: url,
+            lambda: query_params,
+        )
+        req = build_request(
+            query_params, self.body_compression, post_channels=self.post_channels
         )
-        if query_params:
-            query_params = query_params.copy()
-            for key in query_params.keys():
-                value = query_params[key]
-                if isinstance(value, (str, int, float, bool, type(None))):
-                    continue
 
-                if isinstance(value, list):
-                    log.debug(f"Converting to JSON string list `{key}` field")
-                    query_params[key] = json.dumps(
-                        value, default=self._custom_encoder(by_alias=True)
-                    )
+        assert self.session is not None
+        if observation is None:
+            resp = self.session.request(
+                req.method, url, params=req.params, data=req.body, headers=req.headers
+            )
+            resp.raise_for_status()
+            return resp.content
+
+        started_at = time.perf_counter()
+        # Streamed response is decoded chunk by chunk, while its raw stream
+        # still counts bytes received from the wire
+        with self.session.request(
+            req.method,
+            url,
+            params=req.params,
+            data=req.body,
+            headers=req.headers,
+            stream=True,
+        ) as resp:
+            resp.raise_for_status()
+            content = resp.content
+            observation.wire_bytes = resp.raw.tell()
+        observation.latency = time.perf_counter() - started_at
+        observation.response_bytes = len(content)
+
+        return content
+
+
+def encode_query_params(query_params: Optional[dict]) -> Optional[dict]:
+    """
+    Converts complex query parameters values into JSON strings expected by Haas API
 
-                if isinstance(value, BaseModel):
-                    log.debug(f"Converting to JSON string pydantic `{key}` field")
-                    query_params[key] = value.model_dump_json(by_alias=True)
+    Lists and pydantic models are serialized by aliases in a single pass
+    of `pydantic_core`, primitive values are kept as is.
 
-        resp = requests.get(url, params=query_params)
-        resp.raise_for_status()
+    :param query_params: Endpoint parameters
+    :return: Copy of `query_params` with only primitive values
+    """
+    if not query_params:
+        return query_params
+
+    return {
+        key: (
+            value
+            if value is None or isinstance(value, (str, int, float, bool))
+            else _encode_value(value)
+        )
+        for key, value in query_params.items()
+    }
 
-        ta = TypeAdapter(ApiResponse[response_type])
 
-        try:
-            return ta.validate_python(resp.json())
-        except ValidationError:
-            log.error(f"Failed to request: {resp.content}")
-            raise
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (list, BaseModel)):
+        return pydantic_core.to_json(value, by_alias=True).decode()
+    return value
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HttpRequest:
+    """
+    Transport level description of Haas API request.
+    """
 
-    @staticmethod
-    def _custom_encoder(**kwargs):
-        def base_encoder(obj):
-            if isinstance(obj, BaseModel):
-                return obj.model_dump(**kwargs)
-            else:
-                return pydantic_encoder(obj)
+    method: RequestMethod
+    params: Optional[dict]
+    """Encoded URL query parameters."""
 
-        return base_encoder
+    body: Optional[bytes] = None
+    headers: Optional[dict[str, str]] = None
+
+
+def build_request(
+    query_params: Optional[dict],
+    compression: Optional[BodyCompression] = None,
+    compression_min_size: int = 1024,
+    post_channels: Collection[str] = frozenset(),
+) -> HttpRequest:
+    """
+    Chooses HTTP method and encodes parameters as declared for the channel
+
+    GET requests carry everything in URL. POST requests keep only
+    `URL_PARAMS` there and send the rest in the body.
+
+    :param query_params: Endpoint parameters
+    :param compression: Compression of POST body
+    :param compression_min_size: Smaller bodies aren't compressed
+    :param post_channels: Channels sent as POST whatever their declared method is
+    """
+    name = query_params.get("channel") if query_params else None
+    channel = get_channel(name)
+    method = "POST" if name in post_channels else channel and channel.method
+    if method != "POST" or not query_params:
+        return HttpRequest("GET", encode_query_params(query_params))
+
+    url_params = {k: query_params[k] for k in URL_PARAMS if k in query_params}
+    fields = {
+        k: v for k, v in query_params.items() if k not in URL_PARAMS and v is not None
+    }
+
+    match channel.body if channel is not None else "form":
+        case "form":
+            body = urlencode(encode_query_params(fields) or {}).encode()
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        case "json":
+            body = pydantic_core.to_json(fields, by_alias=True)
+            headers = {"Content-Type": "application/json"}
+        case _:
+            raise ValueError(f"Unknown body encoding: {channel.body}")
+
+    if compression is not None and len(body) >= compression_min_size:
+        match compression:
+            case "gzip":
+                body = gzip.compress(body, compresslevel=5)
+            case _:
+                raise ValueError(f"Unknown body compression: {compression}")
+        headers["Content-Encoding"] = compression
+
+    return HttpRequest("POST", url_params, body, headers)
+
+
+def request_key(endpoint: HaasApiEndpoint, query_params: Optional[dict]) -> Hashable:
+    """
+    Builds identity of the request from endpoint and normalized parameters
+
+    Credentials and empty parameters are ignored, so the same request of
+    different sessions has the same key.
+
+    :param endpoint: Requested Haas API endpoint
+    :param query_params: Endpoint parameters
+    """
+    params = encode_query_params(query_params) or {}
+    return (
+        endpoint,
+        tuple(
+            sorted(
+                (key, value)
+                for key, value in params.items()
+                if key not in ("userid", "interfacekey") and value is not None
+            )
+        ),
+    )
+
+
+def parse_api_response(
+    response_type: Type[ApiResponseData],
+    content: bytes,
+    json_backend: JsonBackend = DEFAULT_JSON_BACKEND,
+    observation: Optional[RequestObservation] = None,
+) -> ApiResponse[ApiResponseData]:
+    """
+    Deserializes raw Haas API response
+
+    :param response_type: Pydantic class for response deserialization
+    :param content: Raw response body
+    :param json_backend: Parser used for deserialization
+    :param observation: Receives decoding and validation time if given
+    :return: API response with data deserialized into `response_type`
+    """
+    if response_type is _BACKTEST_SUMMARY_PAGE:
+        resp = _parse_backtest_summary_page(content, observation)
+        return cast("ApiResponse[ApiResponseData]", resp)
+
+    ta = response_adapter(response_type)
+    json_backend = resolve_json_backend(json_backend)
+
+    try:
+        if observation is None:
+            match json_backend:
+                case "orjson":
+                    if orjson is None:
+                        raise ValueError("`orjson` backend requires `orjson` package")
+                    return ta.validate_python(orjson.loads(content))
+                case "pydantic":
+                    return ta.validate_json(content)
+                case _:
+                    raise ValueError(f"Unknown JSON backend: {json_backend}")
+
+        started_at = time.perf_counter()
+        match json_backend:
+            case "orjson":
+                if orjson is None:
+                    raise ValueError("`orjson` backend requires `orjson` package")
+                data = orjson.loads(content)
+                decoded_at = time.perf_counter()
+                observation.decode_time = decoded_at - started_at
+                started_at = decoded_at
+                resp = ta.validate_python(data)
+            case "pydantic":
+                resp = ta.validate_json(content)
+            case _:
+                raise ValueError(f"Unknown JSON backend: {json_backend}")
+        observation.validate_time = time.perf_counter() - started_at
+
+        if not resp.success:
+            observation.error = HaasApiError.__name__
+        return resp
+    except ValidationError:
+        log.error(f"Failed to request: {content}")
+        raise
+
+
+def resolve_json_backend(json_backend: JsonBackend = "auto") -> JsonBackend:
+    """
+    Chooses parser of responses for `auto` backend
+
+    Validated models keep most of decoded objects, so single pass of `pydantic`
+    doesn't save memory while `orjson` is faster.
+
+    :param json_backend: Requested backend, returned as is unless it's `auto`
+    """
+    if json_backend != "auto":
+        return json_backend
+    return "pydantic" if orjson is None else "orjson"
+
+
+def _parse_backtest_summary_page(
+    content: bytes, observation: Optional[RequestObservation] = None
+) -> ApiResponse[PaginatedResponse[UserLabBacktestSummaryResult]]:
+    # Backtests are decoded one by one, so heavy fields of a single backtest
+    # exist at a time, and every backtest keeps its location to load them later
+    started_at = time.perf_counter()
+    text = content.decode()
+
+    def decode_page(key: str, idx: int) -> tuple[Any, int]:
+        if key == "I" and text.startswith("[", idx):
+            return _decode_backtests(text, idx)
+        return _JSON_DECODER.raw_decode(text, idx)
+
+    def decode_envelope(key: str, idx: int) -> tuple[Any, int]:
+        if key == "Data" and text.startswith("{", idx):
+            return _decode_object(text, idx, decode_page)
+        return _JSON_DECODER.raw_decode(text, idx)
+
+    try:
+        envelope, idx = _decode_object(text, _skip_whitespace(text, 0), decode_envelope)
+        if _skip_whitespace(text, idx) != len(text):
+            raise json.JSONDecodeError("Extra data", text, idx)
+        resp = response_adapter(_BACKTEST_SUMMARY_PAGE).validate_python(envelope)
+    except ValidationError:
+        log.error(f"Failed to request: {content}")
+        raise
+
+    if observation is not None:
+        observation.validate_time = time.perf_counter() - started_at
+        if not resp.success:
+            observation.error = HaasApiError.__name__
+    return resp
+
+
+def _decode_object(
+    text: str, idx: int, decode_value: Callable[[str, int], tuple[Any, int]]
+) -> tuple[dict[str, Any], int]:
+    # Object is decoded key by key, so chosen values are decoded differently
+    if not text.startswith("{", idx):
+        raise json.JSONDecodeError("Expecting '{'", text, idx)
+
+    obj: dict[str, Any] = {}
+    idx = _skip_whitespace(text, idx + 1)
+    if text.startswith("}", idx):
+        return obj, idx + 1
+
+    while True:
+        if not text.startswith('"', idx):
+            raise json.JSONDecodeError("Expecting property name", text, idx)
+        key, idx = _JSON_DECODER.raw_decode(text, idx)
+
+        idx = _skip_whitespace(text, idx)
+        if not text.startswith(":", idx):
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+        obj[key], idx = decode_value(key, _skip_whitespace(text, idx + 1))
+
+        idx = _skip_whitespace(text, idx)
+        if text.startswith("}", idx):
+            return obj, idx + 1
+        if not text.startswith(",", idx):
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_whitespace(text, idx + 1)
+
+
+def _decode_backtests(
+    text: str, idx: int
+) -> tuple[list[UserLabBacktestSummaryResult], int]:
+    backtests: list[UserLabBacktestSummaryResult] = []
+    idx = _skip_whitespace(text, idx + 1)
+    if text.startswith("]", idx):
+        return backtests, idx + 1
+
+    while True:
+        start = idx
+        data, idx = _JSON_DECODER.raw_decode(text, idx)
+        backtest = UserLabBacktestSummaryResult.model_validate(data)
+        backtest._raw = RawBacktestItem(text, start, idx)
+        backtests.append(backtest)
+
+        idx = _skip_whitespace(text, idx)
+        if text.startswith("]", idx):
+            return backtests, idx + 1
+        if not text.startswith(",", idx):
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx = _skip_whitespace(text, idx + 1)
+
+
+def _skip_whitespace(text: str, idx: int) -> int:
+    return _JSON_WHITESPACE.match(text, idx).end()  # type: ignore
+
+
+@functools.lru_cache(maxsize=None)
+def response_adapter(
+    response_type: Type[ApiResponseData],
+) -> TypeAdapter[ApiResponse[ApiResponseData]]:
+    """
+    Returns validator of `ApiResponse[response_type]` shared by the whole process
+
+    Parametrizing generic model and building its validator is as expensive as
+    a small request, so it's done only once per response type.
+
+    :param response_type: Pydantic class for response deserialization
+    :return: Type adapter for the API response
+    """
+    return TypeAdapter(ApiResponse[response_type])
+
+
+def adapter_cache_info() -> functools._CacheInfo:
+    """
+    Returns hits, misses and size of response validators cache
+    """
+    return response_adapter.cache_info()
+
+
+def prebuild_response_adapters() -> None:
+    """
+    Builds validators for all response types used by this module,
+    so the first requests don't pay for it
+    """
+    for response_type in _API_RESPONSE_TYPES:
+        response_adapter(response_type)
+
+
+def unwrap_api_response(
+    endpoint: HaasApiEndpoint,
+    resp: ApiResponse[ApiResponseData],
+    query_params: Optional[dict] = None,
+) -> ApiResponseData:
+    """
+    Extracts data of successful API response
+
+    :param endpoint: Requested Haas API endpoint
+    :param resp: Deserialized API response
+    :param query_params: Request parameters used for error message
+    :raises HaasApiError: If API returned any error
+    :return: Response data
+    """
+    if not resp.success:
+        if query_params:
+            req = {
+                k: v
+                for k, v in query_params.items()
+                if k not in ("userid", "interfacekey")
+            }
+        else:
+            req = None
+
+        msg = resp.error or "[No response]"
+
+        raise HaasApiError(
+            f"Failed to request {endpoint}API with {msg}. Input params: {req}"
+        )
+
+    assert resp.data is not None
+
+    return resp.data
+
+
+_API_RESPONSE_TYPES: tuple[Any, ...] = (
+    dict,
+    bool,
+    str,
+    AuthenticatedSessionResponse,
+    list[CloudMarket],
+    list[HaasScriptItemWithDependencies],
+    list[UserAccount],
+    UserLabDetails,
+    PaginatedResponse[UserLabBacktestResult],
+    PaginatedResponse[UserLabBacktestSummaryResult],
+    list[UserLabRecord],
+    HaasBot,
+    list[HaasBot],
+)
 
 
 def get_all_markets(executor: SyncExecutor[Any]) -> list[CloudMarket]:
@@ -483,40 +1044,96 @@ def update_multiple_lab_details(
     return [update_lab_details(executor, detail) for detail in details]
 
 
+@overload
+def get_backtest_result(
+    executor: SyncExecutor[Authenticated],
+    req: GetBacktestResultRequest,
+    summary_only: Literal[False] = False,
+    *,
+    parser: Optional[BacktestPageParser] = None,
+) -> PaginatedResponse[UserLabBacktestResult]: ...
+
+
+@overload
+def get_backtest_result(
+    executor: SyncExecutor[Authenticated],
+    req: GetBacktestResultRequest,
+    summary_only: Literal[True],
+    *,
+    parser: Optional[BacktestPageParser] = None,
+) -> PaginatedResponse[UserLabBacktestSummaryResult]: ...
+
+
 def get_backtest_result(
-    executor: SyncExecutor[Authenticated], req: GetBacktestResultRequest
-) -> PaginatedResponse[UserLabBacktestResult]:
+    executor: SyncExecutor[Authenticated],
+    req: GetBacktestResultRequest,
+    summary_only: bool = False,
+    *,
+    parser: Optional[BacktestPageParser] = None,
+) -> (
+    PaginatedResponse[UserLabBacktestResult]
+    | PaginatedResponse[UserLabBacktestSummaryResult]
+):
     """
     Retrieves the backtest result for a specific lab for an authenticated user.
 
     :param executor: Executor for Haas API interaction
     :param req: Required info for retrieving backtest result
+    :param summary_only: Load runtime, chart and logs of backtests on access
+    :param parser: Parses the page in a process pool, requires `RawExecutor`
     :raises HaasApiError: If requested lab not found
     :return: Backtes result
     """
+    if parser is not None:
+        return parser.get_backtest_result(
+            cast(RawExecutor[Authenticated], executor), req, summary_only
+        )
+
+    response_type = (
+        PaginatedResponse[UserLabBacktestSummaryResult]
+        if summary_only
+        else PaginatedResponse[UserLabBacktestResult]
+    )
     return executor.execute(
         endpoint="Labs",
-        response_type=PaginatedResponse[UserLabBacktestResult],
-        query_params={
-            "channel": "GET_BACKTEST_RESULT_PAGE",
-            "labid": req.lab_id,
-            "nextpageid": req.next_page_id,
-            "pagelength": req.page_lenght,
-        },
+        response_type=response_type,
+        query_params=_backtest_result_params(req),
     )
 
 
-def get_all_labs(executor: SyncExecutor[Authenticated]) -> list[UserLabDetails]:
+def get_backtest_result_raw(
+    executor: RawExecutor[Authenticated], req: GetBacktestResultRequest
+) -> bytes:
+    """
+    Retrieves unparsed backtest result page, e.g. to parse it in another process
+
+    :param executor: Executor for Haas API interaction
+    :param req: Required info for retrieving backtest result
+    :return: Raw response body with `PaginatedResponse` data
+    """
+    return executor.execute_raw("Labs", _backtest_result_params(req))
+
+
+def _backtest_result_params(req: GetBacktestResultRequest) -> dict:
+    return {
+        "channel": "GET_BACKTEST_RESULT_PAGE",
+        "labid": req.lab_id,
+        "nextpageid": req.next_page_id,
+        "pagelength": req.page_lenght,
+    }
+
+
+def get_all_labs(executor: SyncExecutor[Authenticated]) -> list[UserLabRecord]:
     """
     Fetches all labs for the given session
 
     :param executor: Executor for Haas API interaction
     :raises HaasApiError: Not found yet
-    :return: List of the all labs details
+    :return: List of the all labs records
     """
     return executor.execute(
         endpoint="Labs",
-        response_type=list[UserLabRecord],  # type: ignore
+        response_type=list[UserLabRecord],
         query_params={"channel": "GET_LABS"},
     )
 
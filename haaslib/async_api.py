@@ -0,0 +1,617 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import random
+import time
+from typing import (
+    Any,
+    Generic,
+    Iterable,
+    Literal,
+    Optional,
+    Protocol,
+    Self,
+    Type,
+    cast,
+)
+
+import aiohttp
+
+from haaslib.api import (
+    ACCEPT_ENCODING,
+    ApiResponseData,
+    Authenticated,
+    BodyCompression,
+    ConnectionPoolConfig,
+    DEFAULT_JSON_BACKEND,
+    Guest,
+    HaasApiEndpoint,
+    HaasApiError,
+    JsonBackend,
+    State,
+    build_request,
+    generate_interface_key,
+    parse_api_response,
+    unwrap_api_response,
+)
+from haaslib.logger import log
+from haaslib.metrics import MetricsHook, RequestObservation
+from haaslib.model import (
+    AddBotFromLabRequest,
+    ApiResponse,
+    AuthenticatedSessionResponse,
+    CloudMarket,
+    CreateBotRequest,
+    CreateLabRequest,
+    GetBacktestResultRequest,
+    HaasBot,
+    HaasScriptItemWithDependencies,
+    PaginatedResponse,
+    StartLabExecutionRequest,
+    UserAccount,
+    UserLabBacktestResult,
+    UserLabDetails,
+    UserLabRecord,
+)
+
+_lazy_log = log.opt(lazy=True)
+"""Logger which formats messages only if some handler accepts them"""
+
+
+class AsyncExecutor(Protocol, Generic[State]):
+    """
+    Asyncio counterpart of `SyncExecutor` protocol.
+    """
+
+    async def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :return: API response deserialized into `response_type`
+        """
+        ...
+
+
+@dataclasses.dataclass(kw_only=True, slots=True)
+class AiohttpExecutor(Generic[State]):
+    """
+    Implementation of `AsyncExecutor` based on `aiohttp` library.
+
+    Session is created lazily inside of the running event loop, so executor
+    could be constructed anywhere. Single executor could be shared by any
+    number of concurrent tasks, `pool.pool_maxsize` limits amount of
+    simultaneous connections to Haas API.
+    """
+
+    host: str
+    """ Address of the Haas API."""
+
+    port: int
+    """ Port of the Haas API."""
+
+    state: State
+    """ User session state."""
+
+    protocol: Literal["http"] = dataclasses.field(default="http")
+    """Communication protocol (currently only http is valid)."""
+
+    pool: ConnectionPoolConfig = dataclasses.field(default_factory=ConnectionPoolConfig)
+    """Connection pool settings, used only when `session` isn't provided."""
+
+    session: Optional[aiohttp.ClientSession] = dataclasses.field(
+        default=None, repr=False, compare=False
+    )
+    """HTTP session shared by all executors derived from this one."""
+
+    json_backend: JsonBackend = dataclasses.field(default=DEFAULT_JSON_BACKEND)
+    """Parser used for responses deserialization."""
+
+    metrics: Optional[MetricsHook] = dataclasses.field(default=None, compare=False)
+    """Receiver of per request measurements, nothing is measured if not given."""
+
+    post_channels: frozenset[str] = frozenset()
+    """
+    Channels sent as POST with parameters in the body, server must read them
+    from there, e.g. `channels.LARGE_PARAMS_CHANNELS`.
+    """
+
+    body_compression: Optional[BodyCompression] = None
+    """Compression of POST bodies, server must accept `Content-Encoding` for it."""
+
+    accept_encoding: str = ACCEPT_ENCODING
+    """Response encodings offered to the server, used only when `session` isn't provided."""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Releases pooled connections.
+
+        Session is shared with the executor returned from `authenticate`,
+        so closing any of them closes both.
+        """
+        if self.session is not None:
+            await self.session.close()
+
+    async def authenticate(
+        self: AiohttpExecutor[Guest], email: str, password: str
+    ) -> AiohttpExecutor[Authenticated]:
+        """
+        Creates authenticated session in Haas API
+
+        :param email: Email used to login into Web UI
+        :param password: Password used to login into Web UI
+        :raises HaasApiError: If credentials are incorrect
+        """
+        interface_key = generate_interface_key()
+        resp = await self._execute_inner(
+            "User",
+            response_type=dict,
+            query_params={
+                "channel": "LOGIN_WITH_CREDENTIALS",
+                "email": email,
+                "password": password,
+                "interfaceKey": interface_key,
+            },
+        )
+        if not resp.success:
+            raise HaasApiError(resp.error or "Failed to login with credentials")
+
+        resp = await self._execute_inner(
+            "User",
+            response_type=AuthenticatedSessionResponse,
+            query_params={
+                "channel": "LOGIN_WITH_ONE_TIME_CODE",
+                "email": email,
+                "pincode": random.randint(100_000, 200_000),
+                "interfaceKey": interface_key,
+            },
+        )
+        if not resp.success:
+            raise HaasApiError(resp.error or "Failed to login")
+
+        assert resp.data is not None
+
+        state = Authenticated(
+            interface_key=interface_key, user_id=resp.data.data.user_id
+        )
+
+        return cast(
+            AiohttpExecutor[Authenticated],
+            dataclasses.replace(self, state=state, session=self._get_session()),
+        )
+
+    async def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :return: API response deserialized into `response_type`
+        """
+        match self.state:
+            case Authenticated():
+                params = dict(query_params or {})
+                params["userid"] = self.state.user_id
+                params["interfacekey"] = self.state.interface_key
+            case Guest():
+                params = query_params
+            case _:
+                raise ValueError(f"Unknown auth state: {self.state}")
+
+        resp = await self._execute_inner(endpoint, response_type, params)
+
+        return unwrap_api_response(endpoint, resp, query_params)
+
+    async def _execute_inner(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponse[ApiResponseData]:
+        url = f"{self.protocol}://{self.host}:{self.port}/{endpoint}API.php"
+        _lazy_log.debug(
+            "[{}]: Requesting url={} with query_params={}",
+            lambda: self.state.__class__.__name__,
+            lambda: url,
+            lambda: query_params,
+        )
+
+        channel = query_params.get("channel") if query_params else None
+        req = build_request(
+            query_params, self.body_compression, post_channels=self.post_channels
+        )
+        params = self._to_aiohttp_params(req.params)
+
+        if self.metrics is None:
+            async with self._get_session().request(
+                req.method, url, params=params, data=req.body, headers=req.headers
+            ) as resp:
+                resp.raise_for_status()
+                content = await resp.read()
+            return parse_api_response(response_type, content, self.json_backend)
+
+        observation = RequestObservation(endpoint, channel)
+        try:
+            started_at = time.perf_counter()
+            async with self._get_session().request(
+                req.method, url, params=params, data=req.body, headers=req.headers
+            ) as resp:
+                resp.raise_for_status()
+                content = await resp.read()
+                observation.wire_bytes = getattr(
+                    resp.content, "total_raw_bytes", resp.content_length
+                )
+            observation.latency = time.perf_counter() - started_at
+            observation.response_bytes = len(content)
+
+            return parse_api_response(
+                response_type, content, self.json_backend, observation
+            )
+        except Exception as e:
+            observation.error = e.__class__.__name__
+            raise
+        finally:
+            self.metrics.observe(observation)
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self.session is None:
+            connector = aiohttp.TCPConnector(
+                limit=0,
+                limit_per_host=self.pool.pool_maxsize,
+                force_close=not self.pool.keep_alive,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector, headers={"Accept-Encoding": self.accept_encoding}
+            )
+
+        return self.session
+
+    @staticmethod
+    def _to_aiohttp_params(query_params: Optional[dict]) -> Optional[dict]:
+        """
+        `aiohttp` accepts only strings and numbers as query values,
+        so the rest is converted in the same way as `requests` does.
+        """
+        if not query_params:
+            return query_params
+
+        return {
+            key: str(value) if isinstance(value, bool) else value
+            for key, value in query_params.items()
+            if value is not None
+        }
+
+
+async def get_all_markets(executor: AsyncExecutor[Any]) -> list[CloudMarket]:
+    """
+    Retrieves information about all available markets.
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: List with all cloud markets
+    """
+    return await executor.execute(
+        endpoint="Price",
+        response_type=list[CloudMarket],
+        query_params={"channel": "MARKETLIST"},
+    )
+
+
+async def get_all_markets_by_pricesource(
+    executor: AsyncExecutor[Any], price_source: str
+) -> list[CloudMarket]:
+    """
+    Retrieves information about markets from a specific price source.
+
+    :param executor: Executor for Haas API interaction
+    :param price_source: The specific price source for which market information is requested
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: List with cloud markets with the given `price_source`
+    """
+    return await executor.execute(
+        endpoint="Price",
+        response_type=list[CloudMarket],
+        query_params={"channel": "MARKETLIST", "pricesource": price_source},
+    )
+
+
+async def get_unique_pricesources(executor: AsyncExecutor[Any]) -> set[str]:
+    """
+    Returns all unique price sources
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: Set of price sources
+    """
+    all_markets = await get_all_markets(executor)
+    return set(m.price_source for m in all_markets)
+
+
+async def get_all_scripts(
+    executor: AsyncExecutor[Authenticated],
+) -> list[HaasScriptItemWithDependencies]:
+    """
+    Retrieves information about all script items for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: List with all available scripts
+    """
+    return await executor.execute(
+        endpoint="HaasScript",
+        response_type=list[HaasScriptItemWithDependencies],
+        query_params={"channel": "GET_ALL_SCRIPT_ITEMS"},
+    )
+
+
+async def get_accounts(executor: AsyncExecutor[Authenticated]) -> list[UserAccount]:
+    """
+    Retrieves information about user accounts for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: List with all available user accounts
+    """
+    return await executor.execute(
+        endpoint="Account",
+        response_type=list[UserAccount],
+        query_params={"channel": "GET_ACCOUNTS"},
+    )
+
+
+async def create_lab(
+    executor: AsyncExecutor[Authenticated], req: CreateLabRequest
+) -> UserLabDetails:
+    """
+    Creates a new lab for an authenticated user.
+
+    Lab name could be duplicated
+    Market Tag could be created from `CloudMarket`
+
+    :param executor: Executor for Haas API interaction
+    :param req: Details of the lab
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: Created lab details
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=UserLabDetails,
+        query_params={
+            "channel": "CREATE_LAB",
+            "scriptId": req.script_id,
+            "name": req.name,
+            "accountId": req.account_id,
+            "market": req.market.tag,
+            "interval": req.interval,
+            "style": req.default_price_data_style,
+        },
+    )
+
+
+async def start_lab_execution(
+    executor: AsyncExecutor[Authenticated], req: StartLabExecutionRequest
+) -> UserLabDetails:
+    """
+    Starts the execution of a lab for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :param req: Details for starting the lab execution
+    :raises HaasApiError: If something goes wrong (Not found yet)
+    :return: Started lab details
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=UserLabDetails,
+        query_params={
+            "channel": "START_LAB_EXECUTION",
+            "labid": req.lab_id,
+            "startunix": req.start_unix,
+            "endunix": req.end_unix,
+            "sendemail": req.send_email,
+        },
+    )
+
+
+async def get_lab_details(
+    executor: AsyncExecutor[Authenticated], lab_id: str
+) -> UserLabDetails:
+    """
+    Retrieves details about a specific lab for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: The ID of the lab for which details are requested
+    :raises HaasApiError: If lab not found
+    :return: Lab details
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=UserLabDetails,
+        query_params={"channel": "GET_LAB_DETAILS", "labid": lab_id},
+    )
+
+
+async def update_lab_details(
+    executor: AsyncExecutor[Authenticated], details: UserLabDetails
+) -> UserLabDetails:
+    """
+    Updates details for a specific lab for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :param details: The updated UserLabDetails for the lab.
+    :raises HaasApiError: If requested lab not found
+    :return: Updated lab details
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=UserLabDetails,
+        query_params={
+            "channel": "UPDATE_LAB_DETAILS",
+            "labid": details.lab_id,
+            "name": details.name,
+            "type": details.algorithm,
+            "config": details.user_lab_config,
+            "settings": details.haas_script_settings,
+            "parameters": details.parameters,
+        },
+    )
+
+
+async def update_multiple_lab_details(
+    executor: AsyncExecutor[Authenticated], details: Iterable[UserLabDetails]
+) -> list[UserLabDetails]:
+    """
+    Updates details for multiple labs for an authenticated user concurrently.
+
+    :param executor: Executor for Haas API interaction
+    :param details: Iterable with details to update
+    :raises HaasApiError: If requested lab not found
+    :return: Updated lab details in the order of `details`
+    """
+    return list(
+        await asyncio.gather(
+            *(update_lab_details(executor, detail) for detail in details)
+        )
+    )
+
+
+async def get_backtest_result(
+    executor: AsyncExecutor[Authenticated], req: GetBacktestResultRequest
+) -> PaginatedResponse[UserLabBacktestResult]:
+    """
+    Retrieves the backtest result for a specific lab for an authenticated user.
+
+    :param executor: Executor for Haas API interaction
+    :param req: Required info for retrieving backtest result
+    :raises HaasApiError: If requested lab not found
+    :return: Backtes result
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=PaginatedResponse[UserLabBacktestResult],
+        query_params={
+            "channel": "GET_BACKTEST_RESULT_PAGE",
+            "labid": req.lab_id,
+            "nextpageid": req.next_page_id,
+            "pagelength": req.page_lenght,
+        },
+    )
+
+
+async def get_all_labs(
+    executor: AsyncExecutor[Authenticated],
+) -> list[UserLabRecord]:
+    """
+    Fetches all labs for the given session
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: Not found yet
+    :return: List of the all labs records
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=list[UserLabRecord],
+        query_params={"channel": "GET_LABS"},
+    )
+
+
+async def delete_lab(executor: AsyncExecutor[Authenticated], lab_id: str):
+    """
+    Removes Lab with given id
+
+    :param executor: Executor for Haas API interaction
+    :raises HaasApiError: Not found yet
+    """
+    return await executor.execute(
+        endpoint="Labs",
+        response_type=bool,
+        query_params={"channel": "DELETE_LAB", "labid": lab_id},
+    )
+
+
+async def add_bot(
+    executor: AsyncExecutor[Authenticated], req: CreateBotRequest
+) -> HaasBot:
+    """
+    Creates new bot
+
+    :param executor: Executor for Haas API interaction
+    :param req: Details of bot creation
+    :return: Created bot details
+    """
+    return await executor.execute(
+        endpoint="Bot",
+        response_type=HaasBot,
+        query_params={
+            "channel": "ADD_BOT",
+            "botname": req.bot_name,
+            "scriptid": req.script.id,
+            "scripttype": req.script.type,
+            "accountid": req.account_id,
+            "market": req.market.as_market_tag().tag,
+            "leverage": req.leverage,
+            "interval": req.interval,
+            "chartstyle": req.chartstyle,
+        },
+    )
+
+
+async def add_bot_from_lab(
+    executor: AsyncExecutor[Authenticated], req: AddBotFromLabRequest
+) -> HaasBot:
+    """
+    Creates new bot from given lab's backtest
+
+    :param executor: Executor for Haas API interaction
+    :param req: Details of bot creation
+    """
+    return await executor.execute(
+        endpoint="Bot",
+        response_type=HaasBot,
+        query_params={
+            "channel": "ADD_BOT_FROM_LABS",
+            "labid": req.lab_id,
+            "backtestid": req.backtest_id,
+            "botname": req.bot_name,
+            "accountid": req.account_id,
+            "market": req.market.as_market_tag().tag,
+            "leverage": req.leverage,
+        },
+    )
+
+
+async def delete_bot(executor: AsyncExecutor[Authenticated], bot_id: str):
+    return await executor.execute(
+        endpoint="Bot",
+        response_type=str,
+        query_params={"channel": "DELETE_BOT", "botid": bot_id},
+    )
+
+
+async def get_all_bots(executor: AsyncExecutor[Authenticated]) -> list[HaasBot]:
+    return await executor.execute(
+        endpoint="Bot",
+        response_type=list[HaasBot],
+        query_params={"channel": "GET_BOTS"},
+    )
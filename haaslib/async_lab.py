@@ -0,0 +1,48 @@
+import asyncio
+
+from haaslib import async_api
+from haaslib.api import Authenticated
+from haaslib.async_api import AsyncExecutor
+from haaslib.domain import BacktestPeriod
+from haaslib.model import (
+    GetBacktestResultRequest,
+    PaginatedResponse,
+    StartLabExecutionRequest,
+    UserLabBacktestResult,
+    UserLabStatus,
+)
+
+
+async def wait_for_execution(executor: AsyncExecutor[Authenticated], lab_id: str):
+    while True:
+        details = await async_api.get_lab_details(executor, lab_id)
+        match details.status:
+            case UserLabStatus.COMPLETED:
+                break
+            case UserLabStatus.CANCELLED:
+                break
+            case _:
+                pass
+
+        await asyncio.sleep(5)
+
+
+async def backtest(
+    executor: AsyncExecutor[Authenticated], lab_id: str, period: BacktestPeriod
+) -> PaginatedResponse[UserLabBacktestResult]:
+    await async_api.start_lab_execution(
+        executor,
+        StartLabExecutionRequest(
+            lab_id=lab_id,
+            start_unix=period.start_unix,
+            end_unix=period.end_unix,
+            send_email=False,
+        ),
+    )
+
+    await wait_for_execution(executor, lab_id)
+
+    return await async_api.get_backtest_result(
+        executor,
+        GetBacktestResultRequest(lab_id=lab_id, next_page_id=0, page_lenght=1_000_000),
+    )
@@ -0,0 +1,198 @@
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, Iterable, Optional, TypeVar
+
+from haaslib import api
+from haaslib.api import Authenticated, SyncExecutor
+from haaslib.domain import HaaslibExcpetion
+from haaslib.logger import log
+from haaslib.model import CreateBotRequest, HaasBot, UserLabDetails
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+DEFAULT_CONCURRENCY = 8
+"""Should not exceed connection pool size of the executor"""
+
+
+class BatchError(HaaslibExcpetion):
+    """
+    Some items of the batch failed.
+    """
+
+    def __init__(self, failures: list["BatchItemResult"]):
+        self.failures = failures
+        super().__init__(
+            f"{len(failures)} batch items failed, first error: {failures[0].error}"
+        )
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BatchItemResult(Generic[T, R]):
+    """
+    Outcome of a single batch item.
+    """
+
+    item: T
+    """Input item."""
+
+    value: Optional[R] = None
+    """Result of the call if it succeeded."""
+
+    error: Optional[Exception] = None
+    """Error of the call if it failed."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BatchResult(Generic[T, R]):
+    """
+    Outcomes of all batch items in the input order.
+    """
+
+    items: list[BatchItemResult[T, R]]
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def values(self) -> list[R]:
+        """Results of succeeded items"""
+        return [item.value for item in self.items if item.ok]  # type: ignore
+
+    @property
+    def failures(self) -> list[BatchItemResult[T, R]]:
+        return [item for item in self.items if not item.ok]
+
+    def raise_for_errors(self) -> list[R]:
+        """
+        :raises BatchError: If any item failed
+        :return: Results of all items
+        """
+        failures = self.failures
+        if failures:
+            raise BatchError(failures)
+        return self.values
+
+
+def execute_batch(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[T, R]:
+    """
+    Calls `func` for every item in a bounded thread pool
+
+    Failure of some item doesn't stop the others.
+
+    :param func: Independent call, e.g. single API request
+    :param items: Inputs of the call
+    :param concurrency: Maximum amount of simultaneous calls
+    :return: Outcomes in the order of `items`
+    """
+    items = list(items)
+    if not items:
+        return BatchResult([])
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(items)))) as pool:
+        futures = [pool.submit(func, item) for item in items]
+
+    results = []
+    for item, future in zip(items, futures):
+        error = future.exception()
+        if error is None:
+            results.append(BatchItemResult(item, value=future.result()))
+        else:
+            log.warning(f"Batch item {item!r} failed: {error}")
+            results.append(BatchItemResult(item, error=error))  # type: ignore
+
+    return BatchResult(results)
+
+
+def update_multiple_lab_details(
+    executor: SyncExecutor[Authenticated],
+    details: Iterable[UserLabDetails],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[UserLabDetails, UserLabDetails]:
+    """
+    Updates details for multiple labs concurrently
+
+    :param executor: Executor for Haas API interaction
+    :param details: Iterable with details to update
+    :param concurrency: Maximum amount of simultaneous requests
+    :return: Updated lab details
+    """
+    return execute_batch(
+        lambda detail: api.update_lab_details(executor, detail), details, concurrency
+    )
+
+
+def get_labs_details(
+    executor: SyncExecutor[Authenticated],
+    lab_ids: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[str, UserLabDetails]:
+    """
+    Retrieves details of multiple labs concurrently
+
+    :param executor: Executor for Haas API interaction
+    :param lab_ids: Labs for which details are requested
+    :param concurrency: Maximum amount of simultaneous requests
+    :return: Labs details
+    """
+    return execute_batch(
+        lambda lab_id: api.get_lab_details(executor, lab_id), lab_ids, concurrency
+    )
+
+
+def delete_labs(
+    executor: SyncExecutor[Authenticated],
+    lab_ids: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[str, bool]:
+    """
+    Removes multiple labs concurrently
+
+    :param executor: Executor for Haas API interaction
+    :param lab_ids: Labs to remove
+    :param concurrency: Maximum amount of simultaneous requests
+    """
+    return execute_batch(
+        lambda lab_id: api.delete_lab(executor, lab_id), lab_ids, concurrency
+    )
+
+
+def add_bots(
+    executor: SyncExecutor[Authenticated],
+    reqs: Iterable[CreateBotRequest],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[CreateBotRequest, HaasBot]:
+    """
+    Creates multiple bots concurrently
+
+    :param executor: Executor for Haas API interaction
+    :param reqs: Details of bots creation
+    :param concurrency: Maximum amount of simultaneous requests
+    :return: Created bots details
+    """
+    return execute_batch(lambda req: api.add_bot(executor, req), reqs, concurrency)
+
+
+def delete_bots(
+    executor: SyncExecutor[Authenticated],
+    bot_ids: Iterable[str],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> BatchResult[str, str]:
+    """
+    Removes multiple bots concurrently
+
+    :param executor: Executor for Haas API interaction
+    :param bot_ids: Bots to remove
+    :param concurrency: Maximum amount of simultaneous requests
+    """
+    return execute_batch(
+        lambda bot_id: api.delete_bot(executor, bot_id), bot_ids, concurrency
+    )
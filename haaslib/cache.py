@@ -0,0 +1,166 @@
+import dataclasses
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Generic, Hashable, Iterable, Mapping, Optional, Type
+
+from haaslib.api import (
+    ApiResponseData,
+    HaasApiEndpoint,
+    State,
+    SyncExecutor,
+    request_key,
+)
+from haaslib.channels import is_read_channel
+from haaslib.logger import log
+
+DEFAULT_TTLS: dict[str, float] = {
+    "MARKETLIST": 3600.0,
+    "GET_ACCOUNTS": 300.0,
+    "GET_ALL_SCRIPT_ITEMS": 300.0,
+}
+"""Seconds to keep reference data responses by channel"""
+
+INVALIDATIONS: dict[str, tuple[str, ...]] = {
+    "CREATE_LAB": ("GET_LABS",),
+    "UPDATE_LAB_DETAILS": ("GET_LABS", "GET_LAB_DETAILS"),
+    "START_LAB_EXECUTION": ("GET_LABS", "GET_LAB_DETAILS", "GET_BACKTEST_RESULT_PAGE"),
+    "DELETE_LAB": ("GET_LABS", "GET_LAB_DETAILS", "GET_BACKTEST_RESULT_PAGE"),
+    "ADD_BOT": ("GET_BOTS",),
+    "ADD_BOT_FROM_LABS": ("GET_BOTS",),
+    "DELETE_BOT": ("GET_BOTS",),
+}
+"""Cached channels which become stale after the write channel call"""
+
+
+@dataclasses.dataclass
+class CacheStats:
+    """
+    Counters of `CachingExecutor`.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclasses.dataclass(slots=True)
+class _Entry:
+    channel: str
+    expires_at: float
+    value: Any
+
+
+@dataclasses.dataclass
+class CachingExecutor(Generic[State]):
+    """
+    `SyncExecutor` wrapper keeping responses of read channels for a while.
+
+    Only channels with TTL are cached and write channels never are.
+    Cached responses are shared between callers, so they shouldn't be mutated.
+    """
+
+    executor: SyncExecutor[State]
+    """Executor performing actual requests."""
+
+    ttls: Mapping[str, float] = dataclasses.field(
+        default_factory=lambda: dict(DEFAULT_TTLS)
+    )
+    """Seconds to keep responses by channel."""
+
+    max_entries: int = 256
+    """Least recently used responses are evicted above this size."""
+
+    clock: Callable[[], float] = dataclasses.field(default=time.monotonic, repr=False)
+    """Source of current time in seconds."""
+
+    stats: CacheStats = dataclasses.field(default_factory=CacheStats, init=False)
+    """Hit/miss statistics."""
+
+    _entries: OrderedDict[Hashable, _Entry] = dataclasses.field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :return: API response deserialized into `response_type`
+        """
+        channel = (query_params or {}).get("channel")
+        ttl = self.ttls.get(channel) if channel else None
+
+        if not ttl or not is_read_channel(channel):
+            try:
+                return self.executor.execute(endpoint, response_type, query_params)
+            finally:
+                if channel in INVALIDATIONS:
+                    self.invalidate(INVALIDATIONS[channel])
+
+        assert channel is not None
+        key = (response_type, request_key(endpoint, query_params))
+        now = self.clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+            self.stats.misses += 1
+
+        value = self.executor.execute(endpoint, response_type, query_params)
+
+        with self._lock:
+            self._entries[key] = _Entry(channel, now + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+        return value
+
+    def invalidate(self, channels: Optional[Iterable[str]] = None):
+        """
+        Drops cached responses
+
+        :param channels: Channels to drop, everything is dropped if not given
+        """
+        with self._lock:
+            if channels is None:
+                dropped = list(self._entries)
+            else:
+                channels = set(channels)
+                dropped = [
+                    key
+                    for key, entry in self._entries.items()
+                    if entry.channel in channels
+                ]
+
+            for key in dropped:
+                del self._entries[key]
+            self.stats.invalidations += len(dropped)
+
+        if dropped:
+            log.debug(f"Invalidated {len(dropped)} cached responses")
+
+    def __len__(self) -> int:
+        return len(self._entries)
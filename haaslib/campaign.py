@@ -0,0 +1,295 @@
+import dataclasses
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from haaslib import api, lab
+from haaslib.api import Authenticated, SyncExecutor
+from haaslib.domain import BacktestPeriod
+from haaslib.lab import ChangeHaasScriptParameterRequest
+from haaslib.logger import log
+from haaslib.model import (
+    CreateLabRequest,
+    StartLabExecutionRequest,
+    UserLabConfig,
+    UserLabDetails,
+)
+from haaslib.waiter import LabWaiter
+
+
+@dataclasses.dataclass
+class LabSpec:
+    """
+    Lab to create, configure and backtest within a campaign.
+    """
+
+    lab: CreateLabRequest
+    """Lab creation details."""
+
+    period: BacktestPeriod
+    """Backtesting period."""
+
+    params: list[ChangeHaasScriptParameterRequest] = dataclasses.field(
+        default_factory=list
+    )
+    """Script parameters options to change before start."""
+
+    config: Optional[UserLabConfig] = None
+    """Lab optimization config, server defaults are used if not given."""
+
+
+@dataclasses.dataclass
+class LabCampaignResult:
+    """
+    Outcome of a single campaign lab.
+    """
+
+    spec: LabSpec
+    """Lab specification."""
+
+    details: Optional[UserLabDetails] = None
+    """Details of the finished lab (if it was created)."""
+
+    backtests: list[Any] = dataclasses.field(default_factory=list)
+    """Backtest results (summary-only ones by default)."""
+
+    error: Optional[Exception] = None
+    """Error which stopped the lab."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass
+class CampaignStats:
+    """
+    Progress counters of `LabCampaign`.
+    """
+
+    started_labs: int = 0
+    finished_labs: int = 0
+    failed_labs: int = 0
+    backtests: int = 0
+    started_at: float = dataclasses.field(default_factory=time.monotonic)
+
+    @property
+    def backtests_per_hour(self) -> float:
+        elapsed = time.monotonic() - self.started_at
+        return self.backtests * 3600 / elapsed if elapsed > 0 else 0.0
+
+
+class LabCampaign:
+    """
+    Runs a queue of labs keeping Haas backtest queue busy.
+
+    Up to `concurrency` labs are being prepared or executed at any time.
+    Creation and configuration of the next labs happens in background
+    threads while the current ones are running, finished labs are tracked
+    with a single `LabWaiter` and their results are streamed to `on_result`
+    on the calling thread.
+
+    If `concurrency` isn't given, it's adjusted automatically: it grows while
+    every started lab is being executed and shrinks when labs are waiting in
+    the server queue.
+    """
+
+    def __init__(
+        self,
+        executor: SyncExecutor[Authenticated],
+        on_result: Callable[[LabCampaignResult], None],
+        concurrency: Optional[int] = None,
+        max_concurrency: int = 16,
+        workers: int = 4,
+        summary_only: bool = True,
+        page_size: int = 1000,
+        delete_finished: bool = False,
+        min_poll_interval: float = 1.0,
+        max_poll_interval: float = 30.0,
+    ):
+        """
+        :param executor: Executor for Haas API interaction
+        :param on_result: Receives every finished (or failed) lab
+        :param concurrency: Labs in flight, adjusted automatically if not given
+        :param max_concurrency: Upper limit of automatic concurrency
+        :param workers: Threads preparing labs and fetching their results
+        :param summary_only: Fetch backtests loading runtime, chart and logs on access
+        :param page_size: Backtests requested at once
+        :param delete_finished: Remove labs after their results are fetched
+        :param min_poll_interval: Minimum seconds between labs status checks
+        :param max_poll_interval: Maximum seconds between labs status checks
+        """
+        self.executor = executor
+        self.on_result = on_result
+        self.auto_concurrency = concurrency is None
+        self.concurrency = concurrency or min(4, max_concurrency)
+        self.max_concurrency = max_concurrency
+        self.workers = workers
+        self.summary_only = summary_only
+        self.page_size = page_size
+        self.delete_finished = delete_finished
+        self.waiter = LabWaiter(
+            executor, min_interval=min_poll_interval, max_interval=max_poll_interval
+        )
+        self.stats = CampaignStats()
+
+    def run(self, specs: Iterable[LabSpec]) -> CampaignStats:
+        """
+        Executes all labs and returns when the last result is delivered
+
+        :param specs: Labs to execute, could be lazy
+        """
+        self.stats = CampaignStats()
+        queue: Iterator[LabSpec] = iter(specs)
+        exhausted = False
+        preparing: dict[Future, LabSpec] = {}
+        collecting: dict[Future, LabSpec] = {}
+        running: dict[str, LabSpec] = {}
+        next_poll_at = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while True:
+                while (
+                    not exhausted and len(preparing) + len(running) < self.concurrency
+                ):
+                    spec = next(queue, None)
+                    if spec is None:
+                        exhausted = True
+                        break
+                    preparing[pool.submit(self._prepare, spec)] = spec
+
+                for future in [f for f in preparing if f.done()]:
+                    spec = preparing.pop(future)
+                    if future.exception() is not None:
+                        self._deliver(LabCampaignResult(spec, error=future.exception()))
+                        continue
+
+                    lab_id = future.result()
+                    running[lab_id] = spec
+                    self.waiter.add(lab_id)
+                    self.stats.started_labs += 1
+
+                for future in [f for f in collecting if f.done()]:
+                    spec = collecting.pop(future)
+                    if future.exception() is not None:
+                        self._deliver(LabCampaignResult(spec, error=future.exception()))
+                    else:
+                        self._deliver(future.result())
+
+                if running and time.monotonic() >= next_poll_at:
+                    errors: dict[str, Exception] = {}
+                    try:
+                        finished = self.waiter.poll(errors)
+                    except Exception as e:
+                        # Labs keep running on the server, so they are checked again
+                        log.warning(f"Failed to check {len(running)} labs: {e}")
+                        finished = []
+
+                    for details in finished:
+                        spec = running.pop(details.lab_id)
+                        collecting[pool.submit(self._collect, spec, details)] = spec
+                    for lab_id, error in errors.items():
+                        self._deliver(
+                            LabCampaignResult(running.pop(lab_id), error=error)
+                        )
+                    self._adjust_concurrency(len(running))
+                    next_poll_at = time.monotonic() + self.waiter.interval
+
+                if exhausted and not (preparing or running or collecting):
+                    return self.stats
+
+                timeout = max(next_poll_at - time.monotonic(), 0) if running else None
+                in_progress = [*preparing, *collecting]
+                if in_progress:
+                    wait(in_progress, timeout=timeout, return_when=FIRST_COMPLETED)
+                elif timeout:
+                    time.sleep(timeout)
+
+    def _prepare(self, spec: LabSpec) -> str:
+        details = api.create_lab(self.executor, spec.lab)
+        lab_id = details.lab_id
+        try:
+            if spec.params:
+                lab.update_params(details.parameters, spec.params)
+            if spec.config is not None:
+                details.user_lab_config = spec.config
+            if spec.params or spec.config is not None:
+                details = api.update_lab_details(self.executor, details)
+
+            api.start_lab_execution(
+                self.executor,
+                StartLabExecutionRequest(
+                    lab_id=lab_id,
+                    start_unix=spec.period.start_unix,
+                    end_unix=spec.period.end_unix,
+                    send_email=False,
+                ),
+            )
+        except Exception:
+            # Lab which wasn't started isn't reported anywhere, so it's removed
+            try:
+                api.delete_lab(self.executor, lab_id)
+            except Exception as e:
+                log.warning(f"Failed to delete not started lab {lab_id}: {e}")
+            raise
+
+        log.debug(f"Started lab {lab_id}")
+        return lab_id
+
+    def _collect(self, spec: LabSpec, details: UserLabDetails) -> LabCampaignResult:
+        backtests = list(
+            lab.iter_backtest_results(
+                self.executor,
+                details.lab_id,
+                self.page_size,
+                summary_only=self.summary_only,
+            )
+        )
+        if self.delete_finished:
+            api.delete_lab(self.executor, details.lab_id)
+
+        return LabCampaignResult(spec, details=details, backtests=backtests)
+
+    def _deliver(self, result: LabCampaignResult):
+        if result.ok:
+            self.stats.finished_labs += 1
+            self.stats.backtests += len(result.backtests)
+        else:
+            self.stats.failed_labs += 1
+            log.warning(f"Lab {result.spec.lab.name} failed: {result.error}")
+
+        self.on_result(result)
+
+    def _adjust_concurrency(self, running: int):
+        if not self.auto_concurrency or not running:
+            return
+
+        queued = len(self.waiter.queued())
+        if queued > 1 and self.concurrency > 1:
+            self.concurrency -= 1
+        elif queued == 0 and running >= self.concurrency - 1:
+            self.concurrency = min(self.concurrency + 1, self.max_concurrency)
+        else:
+            return
+
+        log.debug(f"Campaign concurrency changed to {self.concurrency}")
+
+
+def run_campaign(
+    executor: SyncExecutor[Authenticated],
+    specs: Iterable[LabSpec],
+    on_result: Callable[[LabCampaignResult], None],
+    concurrency: Optional[int] = None,
+    **kwargs,
+) -> CampaignStats:
+    """
+    Creates, configures and backtests all labs keeping the server busy
+
+    :param executor: Executor for Haas API interaction
+    :param specs: Labs to execute
+    :param on_result: Receives every finished (or failed) lab
+    :param concurrency: Labs in flight, adjusted automatically if not given
+    :param kwargs: Other `LabCampaign` settings
+    :return: Campaign counters
+    """
+    return LabCampaign(executor, on_result, concurrency, **kwargs).run(specs)
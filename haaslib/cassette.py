@@ -0,0 +1,290 @@
+import dataclasses
+import functools
+import gzip
+import json
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Collection, Generic, Literal, Optional, Self, Type
+
+from pydantic import TypeAdapter
+
+from haaslib.api import (
+    DEFAULT_JSON_BACKEND,
+    ApiResponseData,
+    HaasApiEndpoint,
+    HaasApiError,
+    JsonBackend,
+    State,
+    SyncExecutor,
+    parse_api_response,
+    request_key,
+    unwrap_api_response,
+)
+from haaslib.domain import HaaslibExcpetion
+from haaslib.logger import log
+
+CassetteMode = Literal["record", "replay", "auto"]
+"""
+`record` sends every request and stores its response replacing the cassette,
+`replay` answers only from the cassette,
+`auto` replays known requests and records the rest into the cassette
+"""
+
+POLLING_CHANNELS: tuple[str, ...] = ("GET_LABS",)
+"""Channels replayed with the last recorded response, so waiters don't wait"""
+
+
+class CassetteMissError(HaaslibExcpetion):
+    """
+    Request isn't recorded in the cassette.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        super().__init__(f"Request isn't recorded: {key}")
+
+
+@functools.lru_cache(maxsize=None)
+def _data_adapter(response_type: Type[Any]) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+@dataclasses.dataclass
+class CassetteExecutor(Generic[State]):
+    """
+    `SyncExecutor` recording responses to a gzipped JSON lines file and
+    replaying them without network.
+
+    Requests are identified by endpoint and normalized parameters without
+    credentials, so cassette recorded by one session is valid for any other.
+    Every response of the same request is kept, replay returns them in the
+    recorded order and repeats the last one when they are over. `record` mode
+    replaces the existing cassette on save, while `auto` mode adds to it.
+
+    Executors with `execute_raw` are recorded with response bodies as they
+    were received, so replay goes through the same parsing as real requests,
+    could be used to profile it and serves any response type. Other executors
+    are recorded with parsed data, which is replayed only for the same
+    response type.
+    """
+
+    path: Path
+    """Cassette file."""
+
+    executor: Optional[SyncExecutor[State]] = None
+    """Executor performing actual requests, not needed for `replay` mode."""
+
+    mode: CassetteMode = "replay"
+    """How requests are answered."""
+
+    json_backend: JsonBackend = DEFAULT_JSON_BACKEND
+    """Parser used for replayed responses."""
+
+    polling_channels: Collection[str] = POLLING_CHANNELS
+    """Channels which replay jumps straight to the last recorded response."""
+
+    _responses: dict[str, list[bytes]] = dataclasses.field(
+        default_factory=lambda: defaultdict(list), init=False, repr=False
+    )
+    _positions: dict[str, int] = dataclasses.field(
+        default_factory=lambda: defaultdict(int), init=False, repr=False
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        self.path = Path(self.path)
+        if self.mode != "replay" and self.executor is None:
+            raise ValueError(f"`{self.mode}` mode requires executor")
+
+        if self.mode == "record":
+            # Starts from scratch, so stale responses aren't replayed later
+            return
+
+        if self.path.exists():
+            self.load()
+        elif self.mode == "replay":
+            raise FileNotFoundError(self.path)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self.mode != "replay":
+            self.save()
+
+    def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :raises CassetteMissError: If request isn't recorded in `replay` mode
+        :return: API response deserialized into `response_type`
+        """
+        key = self._key(endpoint, query_params)
+        typed_key = self._key(endpoint, query_params, response_type)
+
+        if self.mode != "record":
+            channel = (query_params or {}).get("channel")
+            content = self._replay(key, channel)
+            if content is not None:
+                resp = parse_api_response(response_type, content, self.json_backend)
+                return unwrap_api_response(endpoint, resp, query_params)
+
+            content = self._replay(typed_key, channel)
+            if content is not None:
+                resp = parse_api_response(response_type, content, self.json_backend)
+                if not resp.success:
+                    # Error is already formatted by the recording executor
+                    raise HaasApiError(resp.error)
+                return unwrap_api_response(endpoint, resp, query_params)
+
+            if self.mode == "replay":
+                raise CassetteMissError(key)
+
+        assert self.executor is not None
+        if hasattr(self.executor, "execute_raw"):
+            content = self._record_raw(key, endpoint, query_params)
+            resp = parse_api_response(response_type, content, self.json_backend)
+            return unwrap_api_response(endpoint, resp, query_params)
+
+        # Without raw responses parsed data is stored, so it's replayed only
+        # for the same response type
+        try:
+            value = self.executor.execute(endpoint, response_type, query_params)
+        except HaasApiError as e:
+            self._record(typed_key, {"Success": False, "Error": str(e), "Data": None})
+            raise
+
+        data = _data_adapter(response_type).dump_python(
+            value, mode="json", by_alias=True
+        )
+        self._record(typed_key, {"Success": True, "Error": "", "Data": data})
+        return value
+
+    def execute_raw(
+        self, endpoint: HaasApiEndpoint, query_params: Optional[dict] = None
+    ) -> bytes:
+        """
+        Executes any request to Haas API without parsing its response
+
+        :param endpoint: Actual Haas API endpoint
+        :param query_params: Endpoint parameters
+        :raises CassetteMissError: If request isn't recorded in `replay` mode
+        :raises ValueError: If executor can't return raw responses
+        :return: Raw response body as it was recorded
+        """
+        key = self._key(endpoint, query_params)
+
+        if self.mode != "record":
+            content = self._replay(key, (query_params or {}).get("channel"))
+            if content is not None:
+                return content
+            if self.mode == "replay":
+                raise CassetteMissError(key)
+
+        if not hasattr(self.executor, "execute_raw"):
+            raise ValueError("Raw responses require executor with `execute_raw`")
+        return self._record_raw(key, endpoint, query_params)
+
+    def load(self):
+        """
+        Reads recorded responses from the cassette file
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                self._responses[entry["key"]].append(
+                    json.dumps(entry["response"], separators=(",", ":")).encode()
+                )
+
+        log.debug(f"Loaded {len(self._responses)} requests from {self.path}")
+
+    def save(self):
+        """
+        Writes all recorded responses into the cassette file
+        """
+        with self._lock:
+            entries = [
+                (key, list(responses)) for key, responses in self._responses.items()
+            ]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            for key, responses in entries:
+                for response in responses:
+                    # Response is embedded as is to avoid escaping it as a string
+                    f.write(
+                        f'{{"key":{json.dumps(key)},"response":{response.decode()}}}\n'
+                    )
+        os.replace(tmp, self.path)
+
+        log.debug(f"Saved {len(entries)} requests to {self.path}")
+
+    def rewind(self):
+        """
+        Starts replay from the first recorded responses again
+        """
+        with self._lock:
+            self._positions.clear()
+
+    def _key(
+        self,
+        endpoint: HaasApiEndpoint,
+        query_params: Optional[dict],
+        response_type: Optional[Type[Any]] = None,
+    ) -> str:
+        key = request_key(endpoint, query_params)
+        if response_type is not None:
+            key = (key, repr(response_type))
+        return json.dumps(key, separators=(",", ":"))
+
+    def _replay(self, key: str, channel: Optional[str]) -> Optional[bytes]:
+        with self._lock:
+            responses = self._responses.get(key)
+            if not responses:
+                return None
+
+            if channel in self.polling_channels:
+                return responses[-1]
+
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            return responses[min(position, len(responses) - 1)]
+
+    def _record_raw(
+        self,
+        key: str,
+        endpoint: HaasApiEndpoint,
+        query_params: Optional[dict],
+    ) -> bytes:
+        content = self.executor.execute_raw(endpoint, query_params)  # type: ignore
+        if b"\n" in content:
+            # Every response takes a single line of the cassette
+            stored = json.dumps(json.loads(content), separators=(",", ":")).encode()
+        else:
+            stored = content
+        self._store(key, stored)
+        return content
+
+    def _record(self, key: str, response: dict):
+        self._store(key, json.dumps(response, separators=(",", ":")).encode())
+
+    def _store(self, key: str, content: bytes):
+        with self._lock:
+            self._responses[key].append(content)
+            # Recorded response shouldn't be replayed in `auto` mode again
+            self._positions[key] = len(self._responses[key])
@@ -0,0 +1,86 @@
+import dataclasses
+from typing import Literal, Optional
+
+RequestMethod = Literal["GET", "POST"]
+"""HTTP method of the channel request"""
+
+BodyEncoding = Literal["form", "json"]
+"""
+How POST parameters are sent:
+`form` as urlencoded form with JSON strings for complex values,
+`json` as a single JSON object
+"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Channel:
+    """
+    Single operation of Haas API endpoint.
+    """
+
+    name: str
+    """Value of `channel` query parameter."""
+
+    endpoint: str
+    """Haas API endpoint serving the channel."""
+
+    is_read: bool
+    """Channel doesn't change server state, so it's safe to cache or repeat."""
+
+    method: RequestMethod = "GET"
+    """Method of the channel, executors send others as POST only via `post_channels`."""
+
+    body: BodyEncoding = "form"
+    """Encoding of POST parameters."""
+
+
+CHANNELS: dict[str, Channel] = {
+    channel.name: channel
+    for channel in (
+        Channel("LOGIN_WITH_CREDENTIALS", "User", is_read=False),
+        Channel("LOGIN_WITH_ONE_TIME_CODE", "User", is_read=False),
+        Channel("MARKETLIST", "Price", is_read=True),
+        Channel("GET_ALL_SCRIPT_ITEMS", "HaasScript", is_read=True),
+        Channel("GET_ACCOUNTS", "Account", is_read=True),
+        Channel("CREATE_LAB", "Labs", is_read=False),
+        Channel("START_LAB_EXECUTION", "Labs", is_read=False),
+        Channel("GET_LAB_DETAILS", "Labs", is_read=True),
+        Channel("UPDATE_LAB_DETAILS", "Labs", is_read=False),
+        Channel("GET_BACKTEST_RESULT_PAGE", "Labs", is_read=True),
+        Channel("GET_LABS", "Labs", is_read=True),
+        Channel("DELETE_LAB", "Labs", is_read=False),
+        Channel("ADD_BOT", "Bot", is_read=False),
+        Channel("ADD_BOT_FROM_LABS", "Bot", is_read=False),
+        Channel("DELETE_BOT", "Bot", is_read=False),
+        Channel("GET_BOTS", "Bot", is_read=True),
+    )
+}
+"""All channels used by haaslib"""
+
+LARGE_PARAMS_CHANNELS: frozenset[str] = frozenset({"UPDATE_LAB_DETAILS"})
+"""
+Channels which parameters could outgrow URL, candidates for `post_channels`
+of executors once the server is known to read them from POST body
+"""
+
+
+def is_read_channel(channel: Optional[str]) -> bool:
+    """
+    Checks if channel only reads data. Unknown channels are treated as writes.
+
+    :param channel: Value of `channel` query parameter
+    """
+    if channel is None:
+        return False
+
+    known = CHANNELS.get(channel)
+    return known is not None and known.is_read
+
+
+def get_channel(channel: Optional[str]) -> Optional[Channel]:
+    """
+    Finds channel description
+
+    :param channel: Value of `channel` query parameter
+    """
+    return None if channel is None else CHANNELS.get(channel)
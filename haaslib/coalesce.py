@@ -0,0 +1,93 @@
+import dataclasses
+import threading
+from concurrent.futures import Future
+from typing import Generic, Hashable, Optional, Type
+
+from haaslib.api import (
+    ApiResponseData,
+    HaasApiEndpoint,
+    State,
+    SyncExecutor,
+    request_key,
+)
+from haaslib.channels import is_read_channel
+
+
+@dataclasses.dataclass
+class CoalesceStats:
+    """
+    Counters of `SingleFlightExecutor`.
+    """
+
+    requests: int = 0
+    """Read requests sent to the wrapped executor."""
+
+    shared: int = 0
+    """Read requests served by the identical one in flight."""
+
+
+@dataclasses.dataclass
+class SingleFlightExecutor(Generic[State]):
+    """
+    `SyncExecutor` wrapper merging identical read requests in flight.
+
+    While the request is executed, the same requests from other threads
+    wait for it and receive the same parsed response (or error), so responses
+    shouldn't be mutated. Write channels are always sent as is.
+    """
+
+    executor: SyncExecutor[State]
+    """Executor performing actual requests."""
+
+    stats: CoalesceStats = dataclasses.field(default_factory=CoalesceStats, init=False)
+    """Shared/sent statistics."""
+
+    _in_flight: dict[Hashable, Future] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :return: API response deserialized into `response_type`
+        """
+        if not is_read_channel((query_params or {}).get("channel")):
+            return self.executor.execute(endpoint, response_type, query_params)
+
+        key = (response_type, request_key(endpoint, query_params))
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+                self.stats.requests += 1
+            else:
+                self.stats.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = self.executor.execute(endpoint, response_type, query_params)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                del self._in_flight[key]
@@ -0,0 +1,213 @@
+import array
+import math
+from typing import TYPE_CHECKING, Iterable, Optional, Self, cast
+
+import numpy as np
+
+from haaslib import lab
+from haaslib.api import Authenticated, RawExecutor, SyncExecutor
+from haaslib.model import (
+    PaginatedResponse,
+    UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
+)
+
+if TYPE_CHECKING:
+    from haaslib.parallel import BacktestPageParser
+
+BacktestResult = UserLabBacktestResult | UserLabBacktestSummaryResult
+"""Any backtest result model with `summary`"""
+
+SUMMARY_DTYPE = np.dtype(
+    [
+        ("record_id", np.int64),
+        ("generation_idx", np.int64),
+        ("population_idx", np.int64),
+        ("status", np.int64),
+        ("orders", np.int64),
+        ("trades", np.int64),
+        ("positions", np.int64),
+        ("fee_costs", np.float64),
+        ("realized_profits", np.float64),
+        ("return_on_investment", np.float64),
+    ]
+)
+"""
+Numeric backtest columns.
+
+`fee_costs` and `realized_profits` are summed over all currencies,
+`return_on_investment` is the last value of ROI series (NaN if it's empty).
+"""
+
+
+class BacktestColumns:
+    """
+    Columnar view of backtest results for vectorized filtering and ranking.
+
+    Columns grow with every appended page, results themselves aren't kept,
+    so pages could be dropped right after `extend`.
+    """
+
+    def __init__(self):
+        self._numeric = {
+            name: array.array("d" if SUMMARY_DTYPE[name].kind == "f" else "q")
+            for name in SUMMARY_DTYPE.names or ()
+        }
+        self._backtest_ids: list[str] = []
+        self._parameters: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._backtest_ids)
+
+    @classmethod
+    def from_pages(cls, pages: Iterable[PaginatedResponse]) -> Self:
+        """
+        Builds columns from backtest result pages consuming them one by one
+
+        :param pages: Pages with `UserLabBacktestResult` or summary items
+        """
+        columns = cls()
+        for page in pages:
+            columns.extend(page.items)
+        return columns
+
+    def append(self, result: BacktestResult):
+        """
+        Adds single backtest to the columns
+
+        :param result: Full or summary-only backtest result
+        """
+        summary = result.summary
+        roi = summary.return_on_investment
+        row = (
+            result.record_id,
+            result.generation_idx,
+            result.population_idx,
+            result.status,
+            summary.orders,
+            summary.trades,
+            summary.positions,
+            math.fsum(summary.fee_costs.values()),
+            math.fsum(summary.realized_profits.values()),
+            roi[-1] if roi else math.nan,
+        )
+        for column, value in zip(self._numeric.values(), row):
+            column.append(value)
+
+        idx = len(self._backtest_ids)
+        self._backtest_ids.append(result.backtest_id)
+
+        for key, value in result.parameters.items():
+            values = self._parameters.get(key)
+            if values is None:
+                values = self._parameters[key] = [""] * idx
+            values.append(value)
+
+        for values in self._parameters.values():
+            if len(values) == idx:
+                values.append("")
+
+    def extend(self, results: Iterable[BacktestResult]):
+        """
+        Adds backtests to the columns
+
+        :param results: Full or summary-only backtest results
+        """
+        for result in results:
+            self.append(result)
+
+    def merge(self, other: "BacktestColumns"):
+        """
+        Appends rows of other columns, e.g. built in another process
+
+        :param other: Columns appended after the existing rows
+        """
+        for name, column in self._numeric.items():
+            column.extend(other._numeric[name])
+
+        size, other_size = len(self), len(other)
+        self._backtest_ids.extend(other._backtest_ids)
+
+        for key, values in self._parameters.items():
+            values.extend(other._parameters.get(key) or [""] * other_size)
+        for key, values in other._parameters.items():
+            if key not in self._parameters:
+                self._parameters[key] = [""] * size + values
+
+    def to_numpy(self) -> np.ndarray:
+        """
+        Returns numeric columns as structured array of `SUMMARY_DTYPE`
+        """
+        table = np.empty(len(self), dtype=SUMMARY_DTYPE)
+        for name, column in self._numeric.items():
+            table[name] = np.frombuffer(column, dtype=SUMMARY_DTYPE[name])
+        return table
+
+    def backtest_ids(self) -> np.ndarray:
+        """
+        Returns backtest ids in the same order as rows of `to_numpy`
+        """
+        return np.array(self._backtest_ids, dtype=np.str_)
+
+    def parameters(self) -> dict[str, np.ndarray]:
+        """
+        Returns parameter values by parameter key
+
+        Backtests without some parameter have empty string in its column
+        """
+        return {
+            key: np.array(values, dtype=np.str_)
+            for key, values in self._parameters.items()
+        }
+
+    def top_k(self, column: str, k: int, largest: bool = True) -> np.ndarray:
+        """
+        Finds rows with the best values of numeric column
+
+        :param column: Name of the `SUMMARY_DTYPE` field
+        :param k: Amount of rows to return
+        :param largest: Rank by descending values
+        :return: Row indices sorted from the best one, NaNs are ranked last
+        """
+        values = np.frombuffer(self._numeric[column], dtype=SUMMARY_DTYPE[column])
+        keys = values.astype(np.float64)
+        if largest:
+            keys = -keys
+        keys = np.where(np.isnan(keys), np.inf, keys)
+
+        k = min(k, len(keys))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+
+        idx = np.argpartition(keys, k - 1)[:k]
+        return idx[np.argsort(keys[idx], kind="stable")]
+
+
+def collect_backtest_columns(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    parser: Optional["BacktestPageParser"] = None,
+) -> BacktestColumns:
+    """
+    Streams summary-only backtest results of the lab into columns
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: Lab which results are requested
+    :param page_size: Amount of backtests requested at once
+    :param parser: Builds columns of every page in a process pool,
+        requires `RawExecutor`
+    :raises HaasApiError: If requested lab not found
+    """
+    if parser is not None:
+        columns = BacktestColumns()
+        pages = parser.iter_column_pages(
+            cast(RawExecutor[Authenticated], executor), lab_id, page_size
+        )
+        for page in pages:
+            columns.merge(page.columns)
+        return columns
+
+    return BacktestColumns.from_pages(
+        lab.iter_backtest_pages(executor, lab_id, page_size, summary_only=True)
+    )
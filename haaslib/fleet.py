@@ -0,0 +1,154 @@
+import dataclasses
+import time
+from typing import Any, Callable, Generator, Iterator, Literal, Optional
+
+from haaslib.api import (
+    DEFAULT_JSON_BACKEND,
+    Authenticated,
+    JsonBackend,
+    SyncExecutor,
+    parse_api_response,
+    unwrap_api_response,
+)
+from haaslib.logger import log
+from haaslib.model import HaasBot
+
+FleetEventKind = Literal["added", "removed", "changed"]
+
+_GET_BOTS = {"channel": "GET_BOTS"}
+
+_RAW_BOTS: Any = list[dict[str, Any]]
+"""Bots are decoded without validation, only changed ones are validated"""
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FleetEvent:
+    """
+    Change of a single bot between two fleet snapshots.
+    """
+
+    kind: FleetEventKind
+    bot: HaasBot
+    """Current state of the bot, the last known one if it was removed."""
+
+    previous: Optional[HaasBot] = None
+    """State before the change, only for `changed` events."""
+
+
+class BotFleet:
+    """
+    Snapshot of all user bots refreshed incrementally.
+
+    Every refresh is a single `GET_BOTS` request. Bots are compared with the
+    previous snapshot by `bot_id` and `update_counter`, only added and changed
+    ones are validated into `HaasBot`. Executors with `execute_raw` also skip
+    decoding when response is the same as the previous one.
+    """
+
+    def __init__(
+        self,
+        executor: SyncExecutor[Authenticated],
+        json_backend: JsonBackend = DEFAULT_JSON_BACKEND,
+    ):
+        """
+        :param executor: Executor for Haas API interaction
+        :param json_backend: Parser used for raw responses
+        """
+        self.executor = executor
+        self.json_backend = json_backend
+        self._bots: dict[str, HaasBot] = {}
+        self._content: Optional[bytes] = None
+
+    def __len__(self) -> int:
+        return len(self._bots)
+
+    def __iter__(self) -> Iterator[HaasBot]:
+        return iter(self._bots.values())
+
+    def __contains__(self, bot_id: object) -> bool:
+        return bot_id in self._bots
+
+    def get(self, bot_id: str) -> Optional[HaasBot]:
+        """
+        Finds bot in the current snapshot
+
+        :param bot_id: Id of the bot
+        """
+        return self._bots.get(bot_id)
+
+    @property
+    def bots(self) -> list[HaasBot]:
+        """
+        All bots of the current snapshot in response order
+        """
+        return list(self._bots.values())
+
+    def refresh(self) -> list[FleetEvent]:
+        """
+        Requests all bots and applies them to the snapshot
+
+        The first refresh reports every bot as added.
+
+        :raises HaasApiError: If something goes wrong (Not found yet)
+        :return: Changes since the previous refresh
+        """
+        execute_raw = getattr(self.executor, "execute_raw", None)
+        if execute_raw is None:
+            raw_bots = self.executor.execute("Bot", _RAW_BOTS, _GET_BOTS)
+        else:
+            content: bytes = execute_raw("Bot", _GET_BOTS)
+            if content == self._content:
+                return []
+
+            resp = parse_api_response(_RAW_BOTS, content, self.json_backend)
+            raw_bots = unwrap_api_response("Bot", resp, _GET_BOTS)
+            events = self._apply(raw_bots)
+            # Remembered only once applied, so a failed response is retried
+            self._content = content
+            return events
+
+        return self._apply(raw_bots)
+
+    def watch(
+        self, interval: float = 5.0, sleep: Callable[[float], None] = time.sleep
+    ) -> Generator[FleetEvent, None, None]:
+        """
+        Refreshes the snapshot forever yielding its changes
+
+        :param interval: Seconds between refreshes
+        :param sleep: Used to wait between refreshes
+        :raises HaasApiError: If something goes wrong (Not found yet)
+        """
+        while True:
+            yield from self.refresh()
+            sleep(interval)
+
+    def _apply(self, raw_bots: list[dict[str, Any]]) -> list[FleetEvent]:
+        events: list[FleetEvent] = []
+        previous = self._bots
+        bots: dict[str, HaasBot] = {}
+
+        for raw in raw_bots:
+            bot_id = raw.get("ID")
+            known = previous.get(bot_id) if isinstance(bot_id, str) else None
+            if known is not None and known.update_counter == raw.get("UC"):
+                bots[known.bot_id] = known
+                continue
+
+            bot = HaasBot.model_validate(raw)
+            bots[bot.bot_id] = bot
+            if known is None:
+                events.append(FleetEvent("added", bot))
+            else:
+                events.append(FleetEvent("changed", bot, known))
+
+        events.extend(
+            FleetEvent("removed", bot)
+            for bot_id, bot in previous.items()
+            if bot_id not in bots
+        )
+
+        if events:
+            log.debug(f"Bot fleet of {len(bots)} bots got {len(events)} changes")
+        self._bots = bots
+        return events
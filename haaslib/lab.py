@@ -1,11 +1,23 @@
 import dataclasses
+import functools
 import random
-import time
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Generator, Iterable, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Generator,
+    Iterable,
+    Literal,
+    Optional,
+    Sequence,
+    cast,
+    overload,
+)
 
-from haaslib import api, iterable_extensions
-from haaslib.api import Authenticated, SyncExecutor
+from haaslib import api, waiter
+from haaslib.api import Authenticated, RawExecutor, SyncExecutor
 from haaslib.domain import BacktestPeriod, MarketTag
 from haaslib.model import (
     CreateLabRequest,
@@ -13,11 +25,15 @@ from haaslib.model import (
     PaginatedResponse,
     StartLabExecutionRequest,
     UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
+    UserLabDetails,
     UserLabParameter,
     UserLabParameterOption,
-    UserLabStatus,
 )
 
+if TYPE_CHECKING:
+    from haaslib.parallel import BacktestPageParser
+
 
 @dataclasses.dataclass
 class ChangeHaasScriptParameterRequest:
@@ -25,39 +41,173 @@ class ChangeHaasScriptParameterRequest:
     options: list[UserLabParameterOption]
 
 
+ParameterChange = tuple[int, list[UserLabParameterOption]]
+"""Index of lab parameter and its new options"""
+
+
+class ParameterIndex:
+    """
+    Precompiled lookup of lab parameters by name.
+
+    Name is matched against parameter keys in order of precedence: exact key,
+    case insensitive key, normalized name (key without numeric prefix like
+    `12-12-19-21.`, lowercase and without punctuation) and case insensitive
+    substring of key. Name matching several keys at the same step is an error.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        """
+        :param keys: Keys of lab parameters in their order
+        """
+        self.keys = tuple(keys)
+        self._lowered = [key.lower() for key in self.keys]
+        self._exact: dict[str, list[int]] = {}
+        self._case_insensitive: dict[str, list[int]] = {}
+        self._normalized: dict[str, list[int]] = {}
+
+        for idx, key in enumerate(self.keys):
+            self._exact.setdefault(key, []).append(idx)
+            self._case_insensitive.setdefault(self._lowered[idx], []).append(idx)
+            self._normalized.setdefault(_normalize_param_name(key), []).append(idx)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def for_keys(keys: tuple[str, ...]) -> "ParameterIndex":
+        """
+        Returns shared index for the parameter keys layout
+
+        :param keys: Keys of lab parameters in their order
+        """
+        return ParameterIndex(keys)
+
+    @classmethod
+    def for_parameters(cls, settings: Sequence[UserLabParameter]) -> "ParameterIndex":
+        """
+        Returns shared index for keys of the parameters
+
+        :param settings: Lab parameters
+        """
+        return cls.for_keys(tuple(s.key for s in settings))
+
+    def find(self, name: str) -> int:
+        """
+        Finds index of parameter by its name
+
+        :param name: Full key or its part
+        :raises ValueError: If name doesn't match any key or matches several of them
+        """
+        lowered = name.lower()
+        for candidates in (
+            self._exact.get(name),
+            self._case_insensitive.get(lowered),
+            self._normalized.get(_normalize_param_name(name)),
+        ):
+            if candidates:
+                return self._single(name, candidates)
+
+        return self._single(
+            name, [idx for idx, key in enumerate(self._lowered) if lowered in key]
+        )
+
+    def resolve(
+        self, params: Iterable[ChangeHaasScriptParameterRequest]
+    ) -> list[ParameterChange]:
+        """
+        Finds indices of parameters to change
+
+        :param params: Parameters changes
+        :raises ValueError: If some name is ambiguous or unknown
+        :return: Pairs of parameter index and its new options
+        """
+        return [(self.find(param.name), param.options) for param in params]
+
+    def _single(self, name: str, candidates: list[int]) -> int:
+        if not candidates:
+            raise ValueError(f"Failed to find setting for changer haas script {name=}")
+
+        if len(candidates) > 1:
+            keys = [self.keys[idx] for idx in candidates]
+            raise ValueError(f"Haas script parameter {name=} is ambiguous: {keys}")
+
+        return candidates[0]
+
+
+def _normalize_param_name(name: str) -> str:
+    name = re.sub(r"^[\d-]+\.", "", name)
+    return re.sub(r"[^0-9a-z]", "", name.lower())
+
+
 def update_params(
     settings: Sequence[UserLabParameter],
     params: Iterable[ChangeHaasScriptParameterRequest],
 ):
-    for param in params:
-        param_name = param.name.lower()
-        setting_idx = iterable_extensions.find_idx(
-            settings, lambda s: param_name in s.key.lower()
-        )
+    """
+    Changes options of lab parameters in place
 
-        if setting_idx is None:
-            raise ValueError(f"Failed to find setting for changer haas script {param=}")
+    Names are matched as described in `ParameterIndex`, so name matching
+    several keys raises instead of changing the first of them.
 
-        settings[setting_idx].options = param.options
+    :param settings: Lab parameters
+    :param params: Parameters changes
+    :raises ValueError: If some name is ambiguous or unknown
+    """
+    index = ParameterIndex.for_parameters(settings)
+    for idx, options in index.resolve(params):
+        settings[idx].options = list(options)
 
 
-def wait_for_execution(executor: SyncExecutor[Authenticated], lab_id: str):
-    while True:
-        details = api.get_lab_details(executor, lab_id)
-        match details.status:
-            case UserLabStatus.COMPLETED:
-                break
-            case UserLabStatus.CANCELLED:
-                break
-            case _:
-                pass
+def update_many_params(
+    labs: Iterable[UserLabDetails],
+    params: Sequence[ChangeHaasScriptParameterRequest],
+):
+    """
+    Applies the same parameters changes to many labs details in place
+
+    Names are resolved once per distinct parameters layout,
+    so the cost is linear in the number of labs.
 
-        time.sleep(5)
+    :param labs: Labs details to change
+    :param params: Parameters changes
+    :raises ValueError: If some name is ambiguous or unknown
+    """
+    resolved: dict[tuple[str, ...], list[ParameterChange]] = {}
+    for details in labs:
+        keys = tuple(s.key for s in details.parameters)
+        changes = resolved.get(keys)
+        if changes is None:
+            changes = resolved[keys] = ParameterIndex.for_keys(keys).resolve(params)
 
+        for idx, options in changes:
+            details.parameters[idx].options = list(options)
 
-def backtest(
+
+def wait_for_execution(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    timeout: Optional[float] = None,
+) -> UserLabDetails:
+    """
+    Waits until lab is completed or cancelled
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: Lab to wait for
+    :param timeout: Seconds to wait
+    :raises LabWaitTimeout: If lab wasn't finished in time
+    :return: Details of the finished lab
+    """
+    return next(waiter.wait_for_labs(executor, [lab_id], timeout))
+
+
+def execute_backtest(
     executor: SyncExecutor[Authenticated], lab_id: str, period: BacktestPeriod
-) -> PaginatedResponse[UserLabBacktestResult]:
+):
+    """
+    Starts lab execution and waits until it's finished
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: Lab to backtest
+    :param period: Backtesting period
+    """
     api.start_lab_execution(
         executor,
         StartLabExecutionRequest(
@@ -70,38 +220,214 @@ def backtest(
 
     wait_for_execution(executor, lab_id)
 
+
+@overload
+def backtest(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    period: BacktestPeriod,
+    summary_only: Literal[False] = False,
+) -> PaginatedResponse[UserLabBacktestResult]: ...
+
+
+@overload
+def backtest(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    period: BacktestPeriod,
+    summary_only: Literal[True],
+) -> PaginatedResponse[UserLabBacktestSummaryResult]: ...
+
+
+def backtest(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    period: BacktestPeriod,
+    summary_only: bool = False,
+) -> (
+    PaginatedResponse[UserLabBacktestResult]
+    | PaginatedResponse[UserLabBacktestSummaryResult]
+):
+    execute_backtest(executor, lab_id, period)
+
     return api.get_backtest_result(
         executor,
         GetBacktestResultRequest(lab_id=lab_id, next_page_id=0, page_lenght=1_000_000),
+        summary_only=summary_only,
+    )
+
+
+@overload
+def iter_backtest_pages(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    summary_only: Literal[False] = False,
+    *,
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[PaginatedResponse[UserLabBacktestResult], None, None]: ...
+
+
+@overload
+def iter_backtest_pages(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    *,
+    summary_only: Literal[True],
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[PaginatedResponse[UserLabBacktestSummaryResult], None, None]: ...
+
+
+def iter_backtest_pages(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    summary_only: bool = False,
+    *,
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[PaginatedResponse[Any], None, None]:
+    """
+    Walks through backtest results of the lab page by page
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: Lab which results are requested
+    :param page_size: Amount of backtests in a single page
+    :param prefetch: Request next page while the current one is processed
+    :param summary_only: Load runtime, chart and logs of backtests on access
+    :param parser: Parses pages in a process pool instead of this process,
+        requires `RawExecutor`, `prefetch` is ignored since parser requests
+        pages ahead on its own
+    :raises HaasApiError: If requested lab not found
+    """
+    if parser is not None:
+        yield from parser.iter_backtest_pages(
+            cast(RawExecutor[Authenticated], executor),
+            lab_id,
+            page_size,
+            summary_only,
+        )
+        return
+
+    def fetch(page_id: int) -> PaginatedResponse[Any]:
+        return api.get_backtest_result(
+            executor,
+            GetBacktestResultRequest(
+                lab_id=lab_id, next_page_id=page_id, page_lenght=page_size
+            ),
+            summary_only=summary_only,
+        )
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending: Optional[Future] = None
+        page = fetch(0)
+        while True:
+            has_next = bool(page.items) and page.next_page_id >= 0
+            if has_next and prefetch:
+                pending = pool.submit(fetch, page.next_page_id)
+
+            yield page
+
+            if not has_next:
+                break
+
+            page = pending.result() if pending else fetch(page.next_page_id)
+            pending = None
+
+
+@overload
+def iter_backtest_results(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    summary_only: Literal[False] = False,
+    *,
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[UserLabBacktestResult, None, None]: ...
+
+
+@overload
+def iter_backtest_results(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    *,
+    summary_only: Literal[True],
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[UserLabBacktestSummaryResult, None, None]: ...
+
+
+def iter_backtest_results(
+    executor: SyncExecutor[Authenticated],
+    lab_id: str,
+    page_size: int = 1000,
+    prefetch: bool = True,
+    summary_only: bool = False,
+    *,
+    parser: Optional["BacktestPageParser"] = None,
+) -> Generator[Any, None, None]:
+    """
+    Yields backtest results of the lab keeping only one page in memory
+
+    :param executor: Executor for Haas API interaction
+    :param lab_id: Lab which results are requested
+    :param page_size: Amount of backtests requested at once
+    :param prefetch: Request next page while the current one is consumed
+    :param summary_only: Load runtime, chart and logs of backtests on access
+    :param parser: Parses pages in a process pool, see `iter_backtest_pages`
+    :raises HaasApiError: If requested lab not found
+    """
+    pages = iter_backtest_pages(
+        executor,
+        lab_id,
+        page_size,
+        prefetch,
+        summary_only=summary_only,
+        parser=parser,
     )
+    for page in pages:
+        yield from page.items
 
 
 @contextmanager
 def get_lab_default_params(
-    executor: SyncExecutor[Authenticated], script_id: str
+    executor: SyncExecutor[Authenticated],
+    script_id: str,
+    account_id: Optional[str] = None,
+    market: Optional[MarketTag] = None,
 ) -> Generator[list[UserLabParameter], None, None]:
     """
     Creates buffer lab to get it's default parameters options
 
     :param executor: Executor for Haas API interaction
     :param script_id: Script of lab
+    :param account_id: Account of buffer lab, random one is used if not given
+    :param market: Market of buffer lab, random one is used if not given
     """
-    accounts = api.get_accounts(executor)
-    account = random.choice(accounts)
+    if account_id is None:
+        accounts = api.get_accounts(executor)
+        account_id = random.choice(accounts).account_id
 
-    markets = api.get_all_markets(executor)
-    market = random.choice(markets)
+    if market is None:
+        markets = api.get_all_markets(executor)
+        market = random.choice(markets).as_market_tag()
 
     req = CreateLabRequest(
         script_id=script_id,
         name="buf_lab",
-        account_id=account.account_id,
-        market=market.as_market_tag(),
+        account_id=account_id,
+        market=market,
         interval=1,
         default_price_data_style="CandleStick",
     )
     lab_details = api.create_lab(executor, req)
 
-    yield lab_details.parameters
-
-    api.delete_lab(executor, lab_details.lab_id)
+    try:
+        yield lab_details.parameters
+    finally:
+        api.delete_lab(executor, lab_details.lab_id)
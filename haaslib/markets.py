@@ -0,0 +1,165 @@
+import random
+from collections import defaultdict
+from typing import Any, Collection, Iterable, Optional, Self
+
+from haaslib import api
+from haaslib.api import SyncExecutor
+from haaslib.model import CloudMarket, HaasBot
+
+
+class MarketIndex:
+    """
+    In-memory index over cloud markets.
+
+    Built once from `get_all_markets` response, answers lookups by tag,
+    price source, primary, secondary and category without further requests.
+    """
+
+    def __init__(self, markets: Iterable[CloudMarket]):
+        self.markets: list[CloudMarket] = list(markets)
+        self._by_tag: dict[str, int] = {}
+        self._by_price_source: dict[str, list[int]] = defaultdict(list)
+        self._by_primary: dict[str, list[int]] = defaultdict(list)
+        self._by_secondary: dict[str, list[int]] = defaultdict(list)
+        self._by_category: dict[str, list[int]] = defaultdict(list)
+
+        for idx, market in enumerate(self.markets):
+            self._by_tag[market.as_market_tag().tag] = idx
+            self._by_price_source[market.price_source].append(idx)
+            self._by_primary[market.primary].append(idx)
+            self._by_secondary[market.secondary].append(idx)
+            self._by_category[market.category].append(idx)
+
+    @classmethod
+    def fetch(cls, executor: SyncExecutor[Any]) -> Self:
+        """
+        Builds index from all available markets
+
+        :param executor: Executor for Haas API interaction
+        :raises HaasApiError: If something goes wrong (Not found yet)
+        """
+        return cls(api.get_all_markets(executor))
+
+    def __len__(self) -> int:
+        return len(self.markets)
+
+    def by_tag(self, tag: str) -> Optional[CloudMarket]:
+        """
+        Finds market by its tag, e.g. `BINANCE_BTC_USDT_`
+
+        :param tag: Market tag as returned by `CloudMarket.as_market_tag`
+        """
+        idx = self._by_tag.get(tag)
+        return None if idx is None else self.markets[idx]
+
+    def for_bot(self, bot: HaasBot) -> Optional[CloudMarket]:
+        """
+        Resolves market of the bot
+
+        :param bot: Bot which `market` tag is resolved
+        """
+        return self.by_tag(bot.market)
+
+    def price_sources(self) -> set[str]:
+        return set(self._by_price_source)
+
+    def primaries(self) -> set[str]:
+        return set(self._by_primary)
+
+    def secondaries(self) -> set[str]:
+        return set(self._by_secondary)
+
+    def categories(self) -> set[str]:
+        return set(self._by_category)
+
+    def by_price_source(self, price_source: str) -> list[CloudMarket]:
+        return self._take(self._by_price_source.get(price_source, ()))
+
+    def by_primary(self, primary: str) -> list[CloudMarket]:
+        return self._take(self._by_primary.get(primary, ()))
+
+    def by_secondary(self, secondary: str) -> list[CloudMarket]:
+        return self._take(self._by_secondary.get(secondary, ()))
+
+    def by_category(self, category: str) -> list[CloudMarket]:
+        return self._take(self._by_category.get(category, ()))
+
+    def query(
+        self,
+        price_sources: Optional[Collection[str]] = None,
+        primaries: Optional[Collection[str]] = None,
+        secondaries: Optional[Collection[str]] = None,
+        categories: Optional[Collection[str]] = None,
+    ) -> list[CloudMarket]:
+        """
+        Finds markets matching all given criteria,
+        e.g. USDT perpetuals on some exchanges:
+
+            index.query(
+                price_sources={"BINANCEFUTURES", "BYBIT"},
+                secondaries={"USDT"},
+                categories={"PERPETUAL"},
+            )
+
+        Criteria which aren't given match any market.
+
+        :return: Matching markets in the order of the source list
+        """
+        return self._take(
+            sorted(self._query(price_sources, primaries, secondaries, categories))
+        )
+
+    def sample(
+        self,
+        count: int,
+        price_sources: Optional[Collection[str]] = None,
+        primaries: Optional[Collection[str]] = None,
+        secondaries: Optional[Collection[str]] = None,
+        categories: Optional[Collection[str]] = None,
+    ) -> list[CloudMarket]:
+        """
+        Selects up to `count` random markets matching criteria of `query`
+
+        :param count: Maximum number of markets to return
+        """
+        idxs = self._query(price_sources, primaries, secondaries, categories)
+        if count < len(idxs):
+            idxs = random.sample(sorted(idxs), count)
+        return self._take(idxs)
+
+    def _query(
+        self,
+        price_sources: Optional[Collection[str]],
+        primaries: Optional[Collection[str]],
+        secondaries: Optional[Collection[str]],
+        categories: Optional[Collection[str]],
+    ) -> set[int]:
+        buckets = [
+            (self._by_price_source, price_sources),
+            (self._by_primary, primaries),
+            (self._by_secondary, secondaries),
+            (self._by_category, categories),
+        ]
+
+        # Start from the smallest selection to keep intersections cheap
+        selections = sorted(
+            (
+                [index.get(value, ()) for value in values]
+                for index, values in buckets
+                if values is not None
+            ),
+            key=lambda lists: sum(len(idxs) for idxs in lists),
+        )
+        if not selections:
+            return set(range(len(self.markets)))
+
+        result = {idx for idxs in selections[0] for idx in idxs}
+        for selection in selections[1:]:
+            if not result:
+                break
+            result &= {idx for idxs in selection for idx in idxs}
+
+        return result
+
+    def _take(self, idxs: Iterable[int]) -> list[CloudMarket]:
+        return [self.markets[idx] for idx in idxs]
@@ -0,0 +1,380 @@
+import bisect
+import dataclasses
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Literal, Optional, Protocol
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)  # fmt: skip
+"""Upper bounds in seconds used for network and parse time"""
+
+SIZE_BUCKETS: tuple[float, ...] = tuple(float(4**i * 256) for i in range(10))
+"""Upper bounds in bytes from 256B up to 64MB"""
+
+
+@dataclasses.dataclass(slots=True)
+class RequestObservation:
+    """
+    Measurements of a single request.
+    """
+
+    endpoint: str
+    channel: Optional[str]
+    latency: Optional[float] = None
+    """Seconds from sending the request till the whole body is received."""
+
+    response_bytes: Optional[int] = None
+    """Size of the decoded response body."""
+
+    wire_bytes: Optional[int] = None
+    """Size of the response body as received, before decompression."""
+
+    decode_time: Optional[float] = None
+    """Seconds spent in JSON decoding, not measured for single pass parsing."""
+
+    validate_time: Optional[float] = None
+    """Seconds spent in pydantic validation (including decoding in single pass)."""
+
+    error: Optional[str] = None
+    """Class name of the error, if request failed."""
+
+
+BreakerStateName = Literal["closed", "open", "half_open"]
+
+
+@dataclasses.dataclass(slots=True)
+class RetryObservation:
+    """
+    Outcome of a single call through `RetryingExecutor`.
+    """
+
+    endpoint: str
+    channel: Optional[str]
+    retries: int = 0
+    """Repeated attempts after the first one."""
+
+    gave_up: bool = False
+    """Call failed after all attempts."""
+
+    short_circuited: bool = False
+    """Call was rejected by the open circuit."""
+
+    breaker_state: BreakerStateName = "closed"
+    """Circuit breaker state after the call."""
+
+
+class MetricsHook(Protocol):
+    """
+    Receiver of executor measurements.
+    """
+
+    def observe(self, observation: RequestObservation) -> None:
+        """
+        Called once per request after it's finished or failed
+        """
+        ...
+
+
+class RetryMetricsHook(Protocol):
+    """
+    Receiver of `RetryingExecutor` measurements.
+    """
+
+    def observe_retry(self, observation: RetryObservation) -> None:
+        """
+        Called once per call after all its attempts
+        """
+        ...
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HistogramSnapshot:
+    buckets: tuple[float, ...]
+    counts: tuple[int, ...]
+    """Observations per bucket, the last one is above all bounds."""
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimates quantile assuming uniform distribution inside of buckets
+
+        :param q: Quantile from 0 to 1
+        """
+        if not self.count:
+            return None
+
+        rank = q * self.count
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if idx == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[idx - 1] if idx else 0.0
+                return lower + (self.buckets[idx] - lower) * (rank - seen) / count
+            seen += count
+
+        return self.buckets[-1]
+
+
+class Histogram:
+    """
+    Fixed buckets histogram, not thread safe on its own.
+    """
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        return HistogramSnapshot(self.buckets, tuple(self.counts), self.count, self.sum)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SeriesSnapshot:
+    """
+    Measurements of a single endpoint and channel.
+    """
+
+    requests: int
+    errors: dict[str, int]
+    """Failed requests by error class."""
+    latency: HistogramSnapshot
+    response_bytes: HistogramSnapshot
+    wire_bytes: HistogramSnapshot
+    decode_time: HistogramSnapshot
+    validate_time: HistogramSnapshot
+    retries: int = 0
+    """Repeated attempts of calls through `RetryingExecutor`."""
+    gave_up: int = 0
+    """Calls failed after all retries."""
+    short_circuited: int = 0
+    """Calls rejected by the open circuit."""
+    breaker_state: Optional[BreakerStateName] = None
+    """Circuit breaker state after the last call, if it went through one."""
+
+    @property
+    def compression_ratio(self) -> Optional[float]:
+        """Decoded bytes per received byte"""
+        if not self.wire_bytes.sum:
+            return None
+        return self.response_bytes.sum / self.wire_bytes.sum
+
+
+MetricsSnapshot = dict[tuple[str, str], SeriesSnapshot]
+"""Measurements by endpoint and channel"""
+
+
+class _Series:
+    __slots__ = (
+        "requests",
+        "errors",
+        "latency",
+        "response_bytes",
+        "wire_bytes",
+        "decode_time",
+        "validate_time",
+        "retries",
+        "gave_up",
+        "short_circuited",
+        "breaker_state",
+    )
+
+    def __init__(self):
+        self.requests = 0
+        self.errors: dict[str, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+        self.wire_bytes = Histogram(SIZE_BUCKETS)
+        self.decode_time = Histogram(LATENCY_BUCKETS)
+        self.validate_time = Histogram(LATENCY_BUCKETS)
+        self.retries = 0
+        self.gave_up = 0
+        self.short_circuited = 0
+        self.breaker_state: Optional[BreakerStateName] = None
+
+    def snapshot(self) -> SeriesSnapshot:
+        return SeriesSnapshot(
+            requests=self.requests,
+            errors=dict(self.errors),
+            latency=self.latency.snapshot(),
+            response_bytes=self.response_bytes.snapshot(),
+            wire_bytes=self.wire_bytes.snapshot(),
+            decode_time=self.decode_time.snapshot(),
+            validate_time=self.validate_time.snapshot(),
+            retries=self.retries,
+            gave_up=self.gave_up,
+            short_circuited=self.short_circuited,
+            breaker_state=self.breaker_state,
+        )
+
+
+class InMemoryMetrics:
+    """
+    `MetricsHook` aggregating measurements into histograms per endpoint and channel.
+
+    Also receives `RetryingExecutor` counters as `RetryMetricsHook`.
+    """
+
+    def __init__(self):
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, observation: RequestObservation) -> None:
+        with self._lock:
+            series = self._get_series(observation.endpoint, observation.channel)
+            series.requests += 1
+            if observation.error is not None:
+                series.errors[observation.error] = (
+                    series.errors.get(observation.error, 0) + 1
+                )
+            if observation.latency is not None:
+                series.latency.observe(observation.latency)
+            if observation.response_bytes is not None:
+                series.response_bytes.observe(observation.response_bytes)
+            if observation.wire_bytes is not None:
+                series.wire_bytes.observe(observation.wire_bytes)
+            if observation.decode_time is not None:
+                series.decode_time.observe(observation.decode_time)
+            if observation.validate_time is not None:
+                series.validate_time.observe(observation.validate_time)
+
+    def observe_retry(self, observation: RetryObservation) -> None:
+        with self._lock:
+            series = self._get_series(observation.endpoint, observation.channel)
+            series.retries += observation.retries
+            series.gave_up += observation.gave_up
+            series.short_circuited += observation.short_circuited
+            series.breaker_state = observation.breaker_state
+
+    def snapshot(self) -> MetricsSnapshot:
+        """
+        Returns copy of all measurements
+        """
+        with self._lock:
+            return {key: series.snapshot() for key, series in self._series.items()}
+
+    def reset(self):
+        """
+        Drops all measurements
+        """
+        with self._lock:
+            self._series.clear()
+
+    def _get_series(self, endpoint: str, channel: Optional[str]) -> _Series:
+        key = (endpoint, channel or "")
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series()
+        return series
+
+
+class MetricsExporter(Protocol):
+    """
+    Publishes measurements snapshot somewhere.
+    """
+
+    def export(self, snapshot: MetricsSnapshot) -> None: ...
+
+
+def format_prometheus(snapshot: MetricsSnapshot, prefix: str = "haaslib") -> str:
+    """
+    Renders snapshot in Prometheus text exposition format
+
+    :param snapshot: Measurements from `InMemoryMetrics.snapshot`
+    :param prefix: Prefix of all metric names
+    """
+    lines = [
+        f"# TYPE {prefix}_requests_total counter",
+        *(
+            f"{prefix}_requests_total{{{_labels(key)}}} {series.requests}"
+            for key, series in snapshot.items()
+        ),
+        f"# TYPE {prefix}_request_errors_total counter",
+        *(
+            f'{prefix}_request_errors_total{{{_labels(key)},error="{error}"}} {count}'
+            for key, series in snapshot.items()
+            for error, count in series.errors.items()
+        ),
+    ]
+    counters = [
+        ("request_retries_total", "retries"),
+        ("request_gave_up_total", "gave_up"),
+        ("request_short_circuited_total", "short_circuited"),
+    ]
+    for name, field in counters:
+        lines.append(f"# TYPE {prefix}_{name} counter")
+        lines.extend(
+            f"{prefix}_{name}{{{_labels(key)}}} {getattr(series, field)}"
+            for key, series in snapshot.items()
+            if series.breaker_state is not None
+        )
+
+    lines.append(f"# TYPE {prefix}_circuit_state gauge")
+    lines.extend(
+        f'{prefix}_circuit_state{{{_labels(key)},state="{state}"}} '
+        f"{int(series.breaker_state == state)}"
+        for key, series in snapshot.items()
+        if series.breaker_state is not None
+        for state in ("closed", "open", "half_open")
+    )
+
+    histograms = [
+        ("request_latency_seconds", "latency"),
+        ("response_bytes", "response_bytes"),
+        ("response_wire_bytes", "wire_bytes"),
+        ("json_decode_seconds", "decode_time"),
+        ("validation_seconds", "validate_time"),
+    ]
+    for name, field in histograms:
+        name = f"{prefix}_{name}"
+        lines.append(f"# TYPE {name} histogram")
+        for key, series in snapshot.items():
+            hist: HistogramSnapshot = getattr(series, field)
+            labels = _labels(key)
+            cumulative = 0
+            for bound, count in zip((*hist.buckets, "+Inf"), hist.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+            lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+    return "\n".join(lines) + "\n"
+
+
+@dataclasses.dataclass
+class PrometheusFileExporter:
+    """
+    Writes snapshot into a file for node_exporter textfile collector.
+    """
+
+    path: Path
+    prefix: str = "haaslib"
+
+    def export(self, snapshot: MetricsSnapshot) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            f.write(format_prometheus(snapshot, self.prefix))
+        os.replace(tmp, self.path)
+
+
+def _labels(key: tuple[str, str]) -> str:
+    endpoint, channel = key
+    return f'endpoint="{endpoint}",channel="{channel}"'
@@ -2,9 +2,9 @@ import dataclasses
 import enum
 from typing import Any, Generic, Literal, Optional, Self, Type, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
-from haaslib.domain import MarketTag, Script
+from haaslib.domain import HaaslibExcpetion, MarketTag, Script
 
 T = TypeVar("T")
 
@@ -220,6 +220,7 @@ class UserLabRecord(BaseModel):
     end_unix: int = Field(alias="EU")
     send_email: bool = Field(alias="SE")
     cancel_reason: str = Field(alias="CM")
+    status: Optional[UserLabStatus] = Field(alias="S", default=None)
 
 
 class StartLabExecutionRequest(BaseModel):
@@ -402,3 +403,81 @@ class AddBotFromLabRequest:
     account_id: str
     market: CloudMarket
     leverage: int = 0
+
+
+class BacktestHeavyFields(BaseModel):
+    """
+    Runtime, chart and logs of `UserLabBacktestResult`.
+    """
+
+    runtime: Any = Field(alias="RT")
+    chart: Any = Field(alias="C")
+    logs: Any = Field(alias="L")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RawBacktestItem:
+    """
+    Location of a single backtest in the raw result page.
+    """
+
+    page: str
+    """Whole page, shared by all its backtests."""
+
+    start: int
+    end: int
+
+    def load(self) -> BacktestHeavyFields:
+        return BacktestHeavyFields.model_validate_json(self.page[self.start : self.end])
+
+
+class UserLabBacktestSummaryResult(BaseModel):
+    """
+    `UserLabBacktestResult` with runtime, chart and logs loaded on first access.
+
+    Heavy fields aren't validated with the rest of the backtest, it only keeps
+    its location in the raw page instead. Accessing any of them decodes all
+    three from the backtest own part of the page.
+    """
+
+    record_id: int = Field(alias="RID")
+    user_id: str = Field(alias="UID")
+    lab_id: str = Field(alias="LID")
+    backtest_id: str = Field(alias="BID")
+    generation_idx: int = Field(alias="NG")
+    population_idx: int = Field(alias="NP")
+    status: int = Field(alias="ST")
+    settings: HaasScriptSettings = Field(alias="SE")
+    parameters: dict[str, str] = Field(alias="P")
+    summary: UserLabsBacktestSummary = Field(alias="S")
+
+    _raw: Optional[RawBacktestItem] = PrivateAttr(default=None)
+    _heavy: Optional[BacktestHeavyFields] = PrivateAttr(default=None)
+
+    def __eq__(self, other: object) -> bool:
+        # Only validated fields are compared, raw pages differ between responses
+        if not isinstance(other, UserLabBacktestSummaryResult):
+            return NotImplemented
+        return self.__dict__ == other.__dict__
+
+    @property
+    def runtime(self) -> Any:
+        return self._heavy_fields().runtime
+
+    @property
+    def chart(self) -> Any:
+        return self._heavy_fields().chart
+
+    @property
+    def logs(self) -> Any:
+        return self._heavy_fields().logs
+
+    def _heavy_fields(self) -> BacktestHeavyFields:
+        if self._heavy is None:
+            if self._raw is None:
+                raise HaaslibExcpetion(
+                    "Backtest isn't parsed from raw result page, "
+                    "so its runtime, chart and logs aren't available"
+                )
+            self._heavy = self._raw.load()
+        return self._heavy
@@ -0,0 +1,290 @@
+import dataclasses
+import multiprocessing
+import re
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Generator, Optional, Self, TypeVar
+
+from haaslib import api
+from haaslib.api import (
+    DEFAULT_JSON_BACKEND,
+    Authenticated,
+    JsonBackend,
+    RawExecutor,
+    parse_api_response,
+    unwrap_api_response,
+)
+from haaslib.model import (
+    GetBacktestResultRequest,
+    PaginatedResponse,
+    UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
+)
+
+if TYPE_CHECKING:
+    from haaslib.columnar import BacktestColumns
+
+T = TypeVar("T")
+
+# Backtests have `NP` field too (population index), so page id is matched only
+# right at the start of the page or right after its items
+_LEADING_NEXT_PAGE_ID = re.compile(rb'"Data"\s*:\s*\{\s*"NP"\s*:\s*(-?\d+)')
+_TRAILING_NEXT_PAGE_ID = re.compile(rb'\]\s*,\s*"NP"\s*:\s*(-?\d+)\s*\}')
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ColumnsPage:
+    """
+    Backtest result page converted into columns.
+    """
+
+    columns: "BacktestColumns"
+    next_page_id: int
+
+
+def _parse_page(
+    content: bytes, params: dict, summary_only: bool, json_backend: JsonBackend
+) -> PaginatedResponse[Any]:
+    response_type = (
+        PaginatedResponse[UserLabBacktestSummaryResult]
+        if summary_only
+        else PaginatedResponse[UserLabBacktestResult]
+    )
+    resp = parse_api_response(response_type, content, json_backend)
+    page = unwrap_api_response("Labs", resp, params)
+    # Parametrized generic models can't be pickled, while validated items can
+    return PaginatedResponse.model_construct(
+        items=page.items, next_page_id=page.next_page_id
+    )
+
+
+def _parse_columns(
+    content: bytes, params: dict, json_backend: JsonBackend
+) -> ColumnsPage:
+    # numpy is optional, so columns are available only with `columnar` extra
+    from haaslib.columnar import BacktestColumns
+
+    page = _parse_page(content, params, True, json_backend)
+    columns = BacktestColumns()
+    columns.extend(page.items)
+    return ColumnsPage(columns, page.next_page_id)
+
+
+def _peek_next_page_id(content: bytes) -> Optional[int]:
+    # It's just a guess to request the next page early, the parsed page decides
+    match = _LEADING_NEXT_PAGE_ID.search(content, 0, 256)
+    if match is None:
+        # Items go before page id, so the last match closes the page
+        matches = _TRAILING_NEXT_PAGE_ID.findall(content, max(len(content) - 256, 0))
+        return int(matches[-1]) if matches else None
+    return int(match.group(1))
+
+
+class BacktestPageParser:
+    """
+    Decodes and validates backtest result pages in a process pool.
+
+    Validation of big pages is CPU bound and holds the GIL, so in a pool it
+    doesn't stall other threads and several pages are parsed at once.
+    Workers return parsed pages or `ColumnsPage`, so only compact results
+    should be requested from them: columns or `summary_only` pages, which
+    carry raw page text for lazy fields.
+
+    Requires executor with `execute_raw`, e.g. `RequestsExecutor`.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        json_backend: JsonBackend = DEFAULT_JSON_BACKEND,
+        min_pool_size: int = 256 * 1024,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        prefetch: int = 2,
+    ):
+        """
+        :param max_workers: Worker processes, CPU count by default
+        :param json_backend: Parser used in workers
+        :param min_pool_size: Smaller responses are parsed in the calling thread,
+            since sending them to a worker costs more than parsing
+        :param mp_context: Start method of workers, `spawn` by default
+            because forking threaded process isn't safe
+        :param prefetch: Pages requested ahead of the one being parsed, they are
+            downloaded one by one, so more pages only delay the current one
+        """
+        self.max_workers = max_workers or multiprocessing.cpu_count()
+        self.json_backend = json_backend
+        self.min_pool_size = min_pool_size
+        self.prefetch = prefetch
+        self._mp_context = mp_context or multiprocessing.get_context("spawn")
+        self._pool: Optional[Executor] = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stops worker processes, they are started again on the next parse
+        """
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def parse_page(
+        self, content: bytes, params: dict, summary_only: bool = True
+    ) -> Future[PaginatedResponse[Any]]:
+        """
+        Schedules parsing of raw backtest result page
+
+        :param content: Raw response of `api.get_backtest_result_raw`
+        :param params: Request parameters used for error message
+        :param summary_only: Load runtime, chart and logs of backtests on access
+        :return: Future raising `HaasApiError` if API returned any error
+        """
+        return self._submit(
+            _parse_page, content, params, summary_only, self.json_backend
+        )
+
+    def parse_columns(self, content: bytes, params: dict) -> Future[ColumnsPage]:
+        """
+        Schedules conversion of raw backtest result page into columns
+
+        :param content: Raw response of `api.get_backtest_result_raw`
+        :param params: Request parameters used for error message
+        :return: Future raising `HaasApiError` if API returned any error
+        """
+        return self._submit(_parse_columns, content, params, self.json_backend)
+
+    def get_backtest_result(
+        self,
+        executor: RawExecutor[Authenticated],
+        req: GetBacktestResultRequest,
+        summary_only: bool = True,
+    ) -> PaginatedResponse[Any]:
+        """
+        Retrieves backtest result page and parses it in the pool
+
+        :param executor: Executor for Haas API interaction
+        :param req: Required info for retrieving backtest result
+        :param summary_only: Load runtime, chart and logs of backtests on access
+        :raises HaasApiError: If requested lab not found
+        """
+        content = api.get_backtest_result_raw(executor, req)
+        return self.parse_page(content, _params(req), summary_only).result()
+
+    def iter_backtest_pages(
+        self,
+        executor: RawExecutor[Authenticated],
+        lab_id: str,
+        page_size: int = 1000,
+        summary_only: bool = True,
+    ) -> Generator[PaginatedResponse[Any], None, None]:
+        """
+        Walks through backtest results of the lab page by page
+
+        Next pages are requested while the current one is parsed,
+        up to `prefetch` pages ahead of it.
+
+        :param executor: Executor for Haas API interaction
+        :param lab_id: Lab which results are requested
+        :param page_size: Amount of backtests in a single page
+        :param summary_only: Load runtime, chart and logs of backtests on access
+        :raises HaasApiError: If requested lab not found
+        """
+        return self._iter_pages(
+            executor,
+            lab_id,
+            page_size,
+            lambda content, params: self.parse_page(content, params, summary_only),
+            lambda page: bool(page.items),
+        )
+
+    def iter_column_pages(
+        self,
+        executor: RawExecutor[Authenticated],
+        lab_id: str,
+        page_size: int = 1000,
+    ) -> Generator[ColumnsPage, None, None]:
+        """
+        Walks through backtest results of the lab converted into columns
+
+        :param executor: Executor for Haas API interaction
+        :param lab_id: Lab which results are requested
+        :param page_size: Amount of backtests in a single page
+        :raises HaasApiError: If requested lab not found
+        """
+        return self._iter_pages(
+            executor,
+            lab_id,
+            page_size,
+            self.parse_columns,
+            lambda page: len(page.columns) > 0,
+        )
+
+    def _iter_pages(
+        self,
+        executor: RawExecutor[Authenticated],
+        lab_id: str,
+        page_size: int,
+        parse: Callable[[bytes, dict], Future[T]],
+        has_items: Callable[[T], bool],
+    ) -> Generator[T, None, None]:
+        # Pages in flight with the next page id guessed from their raw content
+        pending: deque[tuple[Optional[int], Future[T]]] = deque()
+        next_page_id: Optional[int] = 0
+        try:
+            while True:
+                while next_page_id is not None and len(pending) <= self.prefetch:
+                    if pending and pending[0][1].done():
+                        # Reading ahead now would only delay the parsed page
+                        break
+                    req = GetBacktestResultRequest(
+                        lab_id=lab_id, next_page_id=next_page_id, page_lenght=page_size
+                    )
+                    content = api.get_backtest_result_raw(executor, req)
+                    guess = _peek_next_page_id(content)
+                    if guess is not None:
+                        guess = max(guess, -1)
+                    pending.append((guess, parse(content, _params(req))))
+                    next_page_id = guess if guess is not None and guess >= 0 else None
+
+                if not pending:
+                    return
+
+                guess, future = pending.popleft()
+                page = future.result()
+                actual = -1
+                if has_items(page) and page.next_page_id >= 0:  # type: ignore
+                    actual = page.next_page_id  # type: ignore
+                if guess != actual:
+                    # Wrong guess, requested pages don't follow this one
+                    for _, other in pending:
+                        other.cancel()
+                    pending.clear()
+                    next_page_id = actual if actual >= 0 else None
+
+                yield page
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def _submit(self, fn: Callable[..., T], content: bytes, *args) -> Future[T]:
+        if len(content) < self.min_pool_size:
+            future: Future[T] = Future()
+            try:
+                future.set_result(fn(content, *args))
+            except BaseException as e:
+                future.set_exception(e)
+            return future
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.max_workers, mp_context=self._mp_context
+            )
+        return self._pool.submit(fn, content, *args)
+
+
+def _params(req: GetBacktestResultRequest) -> dict:
+    return {"labid": req.lab_id, "nextpageid": req.next_page_id}
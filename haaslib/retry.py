@@ -0,0 +1,340 @@
+import dataclasses
+import enum
+import random
+import threading
+import time
+from typing import Callable, Generic, Optional, Type
+
+import requests
+
+from haaslib.api import (
+    ApiResponseData,
+    HaasApiEndpoint,
+    State,
+    SyncExecutor,
+)
+from haaslib.channels import is_read_channel
+from haaslib.domain import HaaslibExcpetion
+from haaslib.logger import log
+from haaslib.metrics import RetryMetricsHook, RetryObservation
+
+
+class CircuitOpenError(HaaslibExcpetion):
+    """
+    Request wasn't sent, because the server considered down.
+    """
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit for {host} is open, retry in {retry_in:.1f}s")
+
+
+class BreakerState(enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops requests to the host after several transient failures in a row.
+
+    After `reset_timeout` seconds single trial request is let through,
+    its success closes the circuit and failure opens it again.
+    """
+
+    def __init__(
+        self,
+        host: str = "",
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param host: Name used in errors and logs
+        :param failure_threshold: Failures in a row which open the circuit
+        :param reset_timeout: Seconds before the trial request
+        :param clock: Source of current time in seconds
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self.opened = 0
+        """How many times circuit was opened"""
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> BreakerState:
+        with self._lock:
+            return self._state()
+
+    def allow(self):
+        """
+        :raises CircuitOpenError: If request shouldn't be sent now
+        """
+        with self._lock:
+            state = self._state()
+            if state == BreakerState.CLOSED:
+                return
+            if state == BreakerState.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+
+            assert self._opened_at is not None
+            retry_in = max(self._opened_at + self.reset_timeout - self.clock(), 0)
+            raise CircuitOpenError(self.host, retry_in)
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                log.info(f"Circuit for {self.host} is closed")
+            self.failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or (
+                self._opened_at is None and self.failures >= self.failure_threshold
+            ):
+                self._opened_at = self.clock()
+                self.opened += 1
+                log.warning(f"Circuit for {self.host} is open")
+            self._trial_in_flight = False
+
+    def _state(self) -> BreakerState:
+        if self._opened_at is None:
+            return BreakerState.CLOSED
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def breaker_for(host: str) -> CircuitBreaker:
+    """
+    Returns circuit breaker shared by all executors of the host
+
+    :param host: Haas server address
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+_TRANSIENT_ERRORS = (
+    requests.ConnectionError,
+    requests.Timeout,
+    # Connection reset while reading the body and truncated compressed body
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """
+    When and how long to wait before repeating failed request.
+    """
+
+    max_attempts: int = 4
+    """Attempts including the first one."""
+
+    base_delay: float = 0.5
+    """Seconds before the first retry."""
+
+    max_delay: float = 30.0
+    """Upper limit of a single delay."""
+
+    multiplier: float = 2.0
+    """Delay growth per attempt."""
+
+    retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+    """HTTP statuses considered transient."""
+
+    def delay(self, attempt: int) -> float:
+        """
+        Full jitter delay before the next attempt
+
+        :param attempt: Number of the failed attempt starting from 1
+        """
+        cap = min(self.base_delay * self.multiplier ** (attempt - 1), self.max_delay)
+        return random.uniform(0, cap)
+
+    def is_transient(self, error: Exception) -> bool:
+        """
+        Checks if the request could succeed being repeated
+        """
+        if isinstance(error, requests.HTTPError):
+            return (
+                error.response is not None
+                and error.response.status_code in self.retry_statuses
+            )
+        return isinstance(error, _TRANSIENT_ERRORS)
+
+
+@dataclasses.dataclass
+class RetryStats:
+    """
+    Counters of `RetryingExecutor`.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    gave_up: int = 0
+    """Requests failed after all attempts."""
+    short_circuited: int = 0
+    """Requests rejected by the open circuit."""
+
+
+@dataclasses.dataclass
+class RetryingExecutor(Generic[State]):
+    """
+    `SyncExecutor` wrapper repeating read requests on transient failures.
+
+    Connection errors (including ones while reading response body), timeouts
+    and HTTP statuses from `policy.retry_statuses` are retried with jittered exponential backoff, but only for read channels.
+    Write channels (`CREATE_LAB`, `ADD_BOT`, ...) are sent once, since
+    their failed attempt could still be applied by the server.
+    Errors reported by Haas API itself are never retried.
+
+    All channels go through the circuit breaker, which by default is
+    shared by all executors of the same host.
+
+    Retries and breaker state are counted in `stats` and reported to
+    `metrics` once per call.
+    """
+
+    executor: SyncExecutor[State]
+    """Executor performing actual requests."""
+
+    policy: RetryPolicy = dataclasses.field(default_factory=RetryPolicy)
+    """Retry settings."""
+
+    breaker: Optional[CircuitBreaker] = None
+    """Circuit breaker, shared one of `host` is used if not given."""
+
+    host: Optional[str] = None
+    """Host of the shared circuit breaker, taken from `executor` if not given."""
+
+    metrics: Optional[RetryMetricsHook] = None
+    """Receives retries and breaker state of every call."""
+
+    sleep: Callable[[float], None] = dataclasses.field(default=time.sleep, repr=False)
+    stats: RetryStats = dataclasses.field(default_factory=RetryStats)
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        if self.breaker is not None:
+            return
+
+        host = self.host or getattr(self.executor, "host", None)
+        if not host:
+            # Otherwise executors of different servers would share one breaker
+            raise ValueError(
+                f"{self.executor.__class__.__name__} has no host, "
+                "pass `breaker` or `host` explicitly"
+            )
+        self.breaker = breaker_for(str(host))
+
+    def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :raises CircuitOpenError: If the server is considered down
+        :return: API response deserialized into `response_type`
+        """
+        assert self.breaker is not None
+        channel = (query_params or {}).get("channel")
+        attempts = self.policy.max_attempts if is_read_channel(channel) else 1
+        observation = RetryObservation(endpoint, channel)
+        with self._lock:
+            self.stats.requests += 1
+
+        try:
+            return self._execute(
+                endpoint, response_type, query_params, attempts, observation
+            )
+        finally:
+            if self.metrics is not None:
+                observation.breaker_state = self.breaker.state.value
+                self.metrics.observe_retry(observation)
+
+    def _execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict],
+        attempts: int,
+        observation: RetryObservation,
+    ) -> ApiResponseData:
+        assert self.breaker is not None
+        attempt = 1
+        while True:
+            try:
+                self.breaker.allow()
+            except CircuitOpenError:
+                observation.short_circuited = True
+                with self._lock:
+                    self.stats.short_circuited += 1
+                raise
+
+            try:
+                resp = self.executor.execute(endpoint, response_type, query_params)
+            except Exception as e:
+                if not self.policy.is_transient(e):
+                    # Server is alive, it's the request which is wrong
+                    self.breaker.record_success()
+                    raise
+
+                self.breaker.record_failure()
+                if attempt >= attempts:
+                    observation.gave_up = True
+                    with self._lock:
+                        self.stats.gave_up += 1
+                    raise
+
+                delay = self._retry_after(e) or self.policy.delay(attempt)
+                log.warning(
+                    f"{observation.channel} attempt {attempt} failed: {e}, "
+                    f"retrying in {delay:.1f}s"
+                )
+                observation.retries += 1
+                with self._lock:
+                    self.stats.retries += 1
+                attempt += 1
+                self.sleep(delay)
+            else:
+                self.breaker.record_success()
+                return resp
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        if not isinstance(error, requests.HTTPError) or error.response is None:
+            return None
+
+        value = error.response.headers.get("Retry-After")
+        if value is None or not value.isdigit():
+            return None
+        return min(float(value), self.policy.max_delay)
@@ -0,0 +1,98 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from pydantic import TypeAdapter
+
+from haaslib import lab
+from haaslib.api import Authenticated, SyncExecutor
+from haaslib.domain import MarketTag
+from haaslib.logger import log
+from haaslib.model import HaasScriptItemWithDependencies, UserLabParameter
+
+_PARAMETERS_ADAPTER = TypeAdapter(list[UserLabParameter])
+
+
+class ScriptParamsStore:
+    """
+    Default lab parameters of scripts, optionally persisted between runs.
+
+    Parameters are keyed by script id and its update time, so buffer lab
+    is created only for new or changed scripts.
+    """
+
+    def __init__(self, path: Optional[str | os.PathLike] = None):
+        """
+        :param path: JSON file to keep parameters in, memory only if not given
+        """
+        self.path = Path(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+
+        if self.path is not None and self.path.exists():
+            try:
+                self._entries = json.loads(self.path.read_text())
+            except (OSError, ValueError) as e:
+                log.warning(f"Ignoring broken script params store {self.path}: {e}")
+
+    def get(
+        self,
+        executor: SyncExecutor[Authenticated],
+        script: HaasScriptItemWithDependencies,
+        account_id: Optional[str] = None,
+        market: Optional[MarketTag] = None,
+    ) -> list[UserLabParameter]:
+        """
+        Returns default lab parameters of the script
+
+        :param executor: Executor for Haas API interaction
+        :param script: Script which parameters are requested
+        :param account_id: Account of buffer lab if it's required
+        :param market: Market of buffer lab if it's required
+        :return: Parameters, which could be modified by caller
+        """
+        with self._lock:
+            entry = self._entries.get(script.script_id)
+            if entry is not None and entry["updated_unix"] == script.updated_unix:
+                self.hits += 1
+                return _PARAMETERS_ADAPTER.validate_python(entry["parameters"])
+            self.misses += 1
+
+        with lab.get_lab_default_params(
+            executor, script.script_id, account_id, market
+        ) as parameters:
+            raw = _PARAMETERS_ADAPTER.dump_python(parameters, by_alias=True)
+
+        with self._lock:
+            self._entries[script.script_id] = {
+                "updated_unix": script.updated_unix,
+                "parameters": raw,
+            }
+            self._save()
+
+        return _PARAMETERS_ADAPTER.validate_python(raw)
+
+    def invalidate(self, script_id: Optional[str] = None):
+        """
+        Forgets parameters
+
+        :param script_id: Script to forget, everything is dropped if not given
+        """
+        with self._lock:
+            if script_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(script_id, None)
+            self._save()
+
+    def _save(self):
+        if self.path is None:
+            return
+
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(self._entries))
+        os.replace(tmp, self.path)
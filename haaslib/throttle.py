@@ -0,0 +1,231 @@
+import dataclasses
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Generator, Generic, Mapping, Optional, Type
+
+from haaslib.api import (
+    ApiResponseData,
+    HaasApiEndpoint,
+    HaasApiError,
+    State,
+    SyncExecutor,
+)
+from haaslib.logger import log
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class RateLimit:
+    """
+    Pace of requests to a single endpoint or channel.
+    """
+
+    rate: float
+    """Maximum requests per second."""
+
+    burst: int = 1
+    """Requests allowed at once after idle period."""
+
+    max_concurrency: Optional[int] = None
+    """Maximum requests in flight, unlimited if not given."""
+
+    adaptive: bool = True
+    """Slow down on errors and slow responses, speed up back on fast ones."""
+
+    target_latency: Optional[float] = None
+    """Response time in seconds considered slow, only errors count if not given."""
+
+    min_rate: float = 0.5
+    """Lowest rate adaptive limiter could slow down to."""
+
+
+@dataclasses.dataclass
+class LimiterStats:
+    """
+    State of a single limiter.
+    """
+
+    rate: float
+    in_flight: int = 0
+    requests: int = 0
+    slowdowns: int = 0
+    waited: float = 0.0
+    """Total seconds requests spent waiting for permission."""
+
+
+class Limiter:
+    """
+    Token bucket with concurrency cap and AIMD rate adaptation.
+    """
+
+    def __init__(
+        self,
+        limit: RateLimit,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.limit = limit
+        self.clock = clock
+        self.sleep = sleep
+        self.stats = LimiterStats(rate=limit.rate)
+        self._tokens = float(limit.burst)
+        self._updated_at = clock()
+        self._slowed_at = float("-inf")
+        self._lock = threading.Lock()
+        self._slots = (
+            threading.BoundedSemaphore(limit.max_concurrency)
+            if limit.max_concurrency
+            else None
+        )
+
+    @contextmanager
+    def acquire(self) -> Generator[None, None, None]:
+        """
+        Blocks until request is allowed and reports its outcome on exit
+        """
+        started_at = self.clock()
+        if self._slots is not None:
+            self._slots.acquire()
+
+        try:
+            self._take_token()
+            with self._lock:
+                self.stats.in_flight += 1
+                self.stats.requests += 1
+                self.stats.waited += self.clock() - started_at
+
+            sent_at = self.clock()
+            try:
+                yield
+            except HaasApiError:
+                # Server answered, so it's not overloaded
+                self._observe(self.clock() - sent_at, failed=False)
+                raise
+            except Exception:
+                self._observe(self.clock() - sent_at, failed=True)
+                raise
+            else:
+                self._observe(self.clock() - sent_at, failed=False)
+            finally:
+                with self._lock:
+                    self.stats.in_flight -= 1
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def _take_token(self):
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(
+                    self._tokens + (now - self._updated_at) * self.stats.rate,
+                    float(self.limit.burst),
+                )
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.stats.rate
+
+            self.sleep(delay)
+
+    def _observe(self, latency: float, failed: bool):
+        if not self.limit.adaptive:
+            return
+
+        slow = (
+            self.limit.target_latency is not None
+            and latency > self.limit.target_latency
+        )
+        with self._lock:
+            now = self.clock()
+            if failed or slow:
+                # Single overload is usually noticed by many requests in flight,
+                # so slow down at most once per round trip
+                if now - self._slowed_at < max(latency, 1 / self.stats.rate):
+                    return
+                self._slowed_at = now
+                self.stats.rate = max(self.stats.rate * 0.7, self.limit.min_rate)
+                self.stats.slowdowns += 1
+                log.debug(f"Slowed down to {self.stats.rate:.2f} requests/s")
+            else:
+                self.stats.rate = min(
+                    self.stats.rate + self.limit.rate * 0.02, self.limit.rate
+                )
+
+
+@dataclasses.dataclass
+class ThrottlingExecutor(Generic[State]):
+    """
+    `SyncExecutor` wrapper pacing requests with per endpoint and channel limits.
+
+    Channel limit takes precedence over endpoint one, requests without any
+    matching limit go through the `default` one (if it's given).
+    """
+
+    executor: SyncExecutor[State]
+    """Executor performing actual requests."""
+
+    limits: Mapping[str, RateLimit] = dataclasses.field(default_factory=dict)
+    """Limits by endpoint (`Labs`, `Bot`, ...) or channel (`GET_LAB_DETAILS`, ...)."""
+
+    default: Optional[RateLimit] = None
+    """Limit shared by the rest of requests."""
+
+    _limiters: dict[str, Limiter] = dataclasses.field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def execute(
+        self,
+        endpoint: HaasApiEndpoint,
+        response_type: Type[ApiResponseData],
+        query_params: Optional[dict] = None,
+    ) -> ApiResponseData:
+        """
+        Executes any request to Haas API and serialized it's reponse
+
+        :param endpoint: Actual Haas API endpoint
+        :param response_type: Pydantic class for response deserialization
+        :param query_params: Endpoint parameters
+        :raises HaasApiError: If API returned any error
+        :return: API response deserialized into `response_type`
+        """
+        limiter = self._limiter(endpoint, (query_params or {}).get("channel"))
+        if limiter is None:
+            return self.executor.execute(endpoint, response_type, query_params)
+
+        with limiter.acquire():
+            return self.executor.execute(endpoint, response_type, query_params)
+
+    def stats(self) -> dict[str, LimiterStats]:
+        """
+        Returns copy of limiters state by limit name (`*` for the default one)
+        """
+        with self._lock:
+            limiters = dict(self._limiters)
+        return {name: dataclasses.replace(lim.stats) for name, lim in limiters.items()}
+
+    def _limiter(self, endpoint: str, channel: Optional[str]) -> Optional[Limiter]:
+        if channel is not None and channel in self.limits:
+            name = channel
+        elif endpoint in self.limits:
+            name = endpoint
+        elif self.default is not None:
+            name = "*"
+        else:
+            return None
+
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(name)
+                if limiter is None:
+                    limit = self.limits.get(name) or self.default
+                    assert limit is not None
+                    limiter = self._limiters[name] = Limiter(limit)
+
+        return limiter
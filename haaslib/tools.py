@@ -3,6 +3,7 @@ from typing import Any, Callable, Optional
 
 from haaslib import api
 from haaslib.api import SyncExecutor
+from haaslib.markets import MarketIndex
 from haaslib.model import CloudMarket
 
 
@@ -10,6 +11,7 @@ def select_random_markets(
     executor: SyncExecutor[Any],
     count: int,
     filterer: Optional[Callable[[CloudMarket], bool]] = None,
+    index: Optional[MarketIndex] = None,
 ) -> list[CloudMarket]:
     """
     Selects a specified `count` of random markets from a list obtained
@@ -18,11 +20,16 @@ def select_random_markets(
     :param executor: Executor for Haas API interaction
     :param count: Maxmimum number of markets to return
     :param filterer: Decides which markets should stay (returns `True` for them)
+    :param index: Prebuilt index used instead of requesting markets
     :raises HaasApiError: If something goes wrong (Not found yet)
     :return: A list of cloud markets that meet the filter criteria,
              randomly selected up to the specified count.
     """
-    all_markets = api.get_all_markets(executor)
+    if index is not None:
+        all_markets = index.markets
+    else:
+        all_markets = api.get_all_markets(executor)
+
     if filterer:
         filtered_markets = [m for m in all_markets if filterer(m)]
     else:
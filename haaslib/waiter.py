@@ -0,0 +1,253 @@
+import dataclasses
+import time
+from typing import Callable, Generator, Iterable, Optional
+
+from haaslib import api
+from haaslib.api import Authenticated, SyncExecutor
+from haaslib.domain import HaaslibExcpetion
+from haaslib.logger import log
+from haaslib.model import UserLabDetails, UserLabRecord, UserLabStatus
+
+FINISHED_STATUSES = (UserLabStatus.COMPLETED, UserLabStatus.CANCELLED)
+"""Lab statuses which won't change anymore"""
+
+
+class LabWaitTimeout(HaaslibExcpetion):
+    """
+    Labs weren't finished before the deadline.
+    """
+
+    def __init__(self, lab_ids: Iterable[str]):
+        self.lab_ids = sorted(lab_ids)
+        super().__init__(f"Labs weren't finished in time: {self.lab_ids}")
+
+
+@dataclasses.dataclass
+class _LabProgress:
+    status: Optional[UserLabStatus] = None
+    completed: int = 0
+    scheduled: int = 0
+    observed_at: Optional[float] = None
+    changed_at: Optional[float] = None
+    rate: Optional[float] = None
+    """Completed backtests per second"""
+
+    def update(self, record: UserLabRecord, now: float):
+        if self.observed_at is not None and record.completed_backtests > self.completed:
+            rate = (record.completed_backtests - self.completed) / max(
+                now - self.observed_at, 1e-3
+            )
+            self.rate = rate if self.rate is None else 0.5 * self.rate + 0.5 * rate
+
+        if self.changed_at is None or record.completed_backtests != self.completed:
+            self.changed_at = now
+
+        self.status = record.status
+        self.completed = record.completed_backtests
+        self.scheduled = record.scheduled_backtests
+        self.observed_at = now
+
+    @property
+    def eta(self) -> Optional[float]:
+        if not self.rate:
+            return None
+        return max(self.scheduled - self.completed, 0) / self.rate
+
+
+class LabWaiter:
+    """
+    Waits for completion of many labs at once.
+
+    Every poll is a single `GET_LABS` request for all tracked labs, full
+    details are requested only for labs which look finished. Poll interval
+    follows backtests progress: it shrinks when some lab is about to finish
+    and grows while nothing changes.
+    """
+
+    def __init__(
+        self,
+        executor: SyncExecutor[Authenticated],
+        lab_ids: Iterable[str] = (),
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """
+        :param executor: Executor for Haas API interaction
+        :param lab_ids: Labs to track
+        :param min_interval: Minimum seconds between polls
+        :param max_interval: Maximum seconds between polls
+        :param clock: Source of current time in seconds
+        :param sleep: Blocks for given amount of seconds
+        """
+        self.executor = executor
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.sleep = sleep
+        self.interval = min_interval
+        self._progress: dict[str, _LabProgress] = {}
+        for lab_id in lab_ids:
+            self.add(lab_id)
+
+    @property
+    def pending(self) -> set[str]:
+        """Tracked labs which aren't finished yet"""
+        return set(self._progress)
+
+    def queued(self) -> set[str]:
+        """
+        Tracked labs which are waiting for the server to start their backtests
+        """
+        return {
+            lab_id
+            for lab_id, progress in self._progress.items()
+            if progress.status == UserLabStatus.QUEUED
+            or (
+                progress.status is None
+                and progress.completed == 0
+                and progress.observed_at is not None
+                and progress.changed_at is not None
+                and progress.changed_at < progress.observed_at
+            )
+        }
+
+    def add(self, lab_id: str):
+        """
+        Starts tracking of the lab
+
+        :param lab_id: Lab to track
+        """
+        self._progress.setdefault(lab_id, _LabProgress())
+
+    def discard(self, lab_id: str):
+        """
+        Stops tracking of the lab
+
+        :param lab_id: Tracked lab
+        """
+        self._progress.pop(lab_id, None)
+
+    def poll(
+        self, errors: Optional[dict[str, Exception]] = None
+    ) -> list[UserLabDetails]:
+        """
+        Checks all tracked labs once and stops tracking the finished ones
+
+        :param errors: Receives details request errors by lab id instead of
+            raising them, such labs aren't tracked anymore
+        :raises HaasApiError: If tracked lab not found
+        :return: Details of labs finished since the previous poll
+        """
+        if not self._progress:
+            return []
+
+        now = self.clock()
+        records = {
+            record.lab_id: record
+            for record in api.get_all_labs(self.executor)
+            if record.lab_id in self._progress
+        }
+
+        finished = []
+        for lab_id, progress in list(self._progress.items()):
+            record = records.get(lab_id)
+            if record is not None:
+                progress.update(record, now)
+                if not self._looks_finished(record, progress, now):
+                    continue
+
+            try:
+                details = api.get_lab_details(self.executor, lab_id)
+            except Exception as e:
+                if errors is None:
+                    raise
+                del self._progress[lab_id]
+                errors[lab_id] = e
+                continue
+
+            if details.status in FINISHED_STATUSES:
+                del self._progress[lab_id]
+                finished.append(details)
+            else:
+                progress.changed_at = now
+
+        self.interval = self._next_interval(bool(finished))
+        return finished
+
+    def wait(
+        self, timeout: Optional[float] = None
+    ) -> Generator[UserLabDetails, None, None]:
+        """
+        Yields details of every tracked lab as soon as it's finished
+
+        :param timeout: Seconds to wait for all labs
+        :raises LabWaitTimeout: If some labs weren't finished in time
+        :raises HaasApiError: If tracked lab not found
+        """
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            yield from self.poll()
+
+            if not self._progress:
+                return
+
+            delay = self.interval
+            if deadline is not None:
+                left = deadline - self.clock()
+                if left <= 0:
+                    raise LabWaitTimeout(self._progress)
+                delay = min(delay, left)
+
+            log.debug(f"Waiting {delay:.1f}s for {len(self._progress)} labs")
+            self.sleep(delay)
+
+    def _looks_finished(
+        self, record: UserLabRecord, progress: _LabProgress, now: float
+    ) -> bool:
+        if record.status is not None:
+            return record.status in FINISHED_STATUSES
+
+        if record.scheduled_backtests and (
+            record.completed_backtests >= record.scheduled_backtests
+        ):
+            return True
+
+        # Without status in the record stalled labs are checked from time to time,
+        # since they could be cancelled
+        assert progress.changed_at is not None
+        return now - progress.changed_at >= self.max_interval
+
+    def _next_interval(self, any_finished: bool) -> float:
+        etas = [p.eta for p in self._progress.values() if p.eta is not None]
+        if any_finished:
+            interval = self.min_interval
+        elif etas:
+            interval = min(etas) / 2
+        else:
+            interval = self.interval * 1.5
+
+        return min(max(interval, self.min_interval), self.max_interval)
+
+
+def wait_for_labs(
+    executor: SyncExecutor[Authenticated],
+    lab_ids: Iterable[str],
+    timeout: Optional[float] = None,
+    min_interval: float = 1.0,
+    max_interval: float = 30.0,
+) -> Generator[UserLabDetails, None, None]:
+    """
+    Yields details of every lab as soon as it's completed or cancelled
+
+    :param executor: Executor for Haas API interaction
+    :param lab_ids: Labs to wait for
+    :param timeout: Seconds to wait for all labs
+    :param min_interval: Minimum seconds between polls
+    :param max_interval: Maximum seconds between polls
+    :raises LabWaitTimeout: If some labs weren't finished in time
+    :raises HaasApiError: If some lab not found
+    """
+    waiter = LabWaiter(executor, lab_ids, min_interval, max_interval)
+    yield from waiter.wait(timeout)
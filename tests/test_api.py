@@ -0,0 +1,74 @@
+import gzip
+from urllib.parse import parse_qsl
+
+import requests
+
+from benchmarks import payloads
+from benchmarks.stub_server import StubServer
+from haaslib import api
+from haaslib.api import Authenticated, RequestsExecutor
+from haaslib.channels import LARGE_PARAMS_CHANNELS
+from haaslib.model import UserLabDetails
+
+PARAMS = {"channel": "UPDATE_LAB_DETAILS", "labid": "lab-0", "name": "x" * 2000}
+
+
+class RecordingSession(requests.Session):
+    def __init__(self):
+        super().__init__()
+        self.methods: list[str] = []
+
+    def request(self, method, url, *args, **kwargs):
+        self.methods.append(method)
+        return super().request(method, url, *args, **kwargs)
+
+
+def test_channels_are_sent_as_get_by_default():
+    req = api.build_request(PARAMS, compression="gzip")
+
+    assert (req.method, req.body) == ("GET", None)
+    assert req.params == PARAMS
+
+
+def test_post_channels_opt_in():
+    req = api.build_request(PARAMS, post_channels=LARGE_PARAMS_CHANNELS)
+
+    assert req.method == "POST"
+    assert req.params == {"channel": "UPDATE_LAB_DETAILS"}
+    assert req.body is not None
+    assert dict(parse_qsl(req.body.decode())) == {"labid": "lab-0", "name": "x" * 2000}
+
+
+def test_post_body_compression():
+    req = api.build_request(
+        PARAMS, compression="gzip", post_channels={"UPDATE_LAB_DETAILS"}
+    )
+
+    assert req.headers is not None and req.headers["Content-Encoding"] == "gzip"
+    assert req.body is not None
+    assert b"x" * 2000 in gzip.decompress(req.body)
+
+
+def test_executor_sends_post_channels_as_post():
+    with StubServer(markets=1, bots=1, accounts=1, scripts=1, backtests=1) as server:
+        (lab_id,) = server.add_labs(1)
+        details = UserLabDetails.model_validate(payloads.lab_details(lab_id))
+        state = Authenticated(user_id="user-0", interface_key="1234567890")
+
+        sessions = []
+        for post_channels in (frozenset(), LARGE_PARAMS_CHANNELS):
+            session = RecordingSession()
+            executor = RequestsExecutor(
+                host=server.host,
+                port=server.port,
+                state=state,
+                session=session,
+                post_channels=post_channels,
+                body_compression="gzip",
+            )
+            assert api.update_lab_details(executor, details).lab_id == lab_id
+            sessions.append(session)
+
+    assert sessions[0].methods == ["GET"]
+    assert sessions[1].methods == ["POST"]
+    assert server.requests["UPDATE_LAB_DETAILS"] == 2
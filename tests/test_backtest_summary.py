@@ -0,0 +1,84 @@
+import json
+import pickle
+
+import pytest
+
+from benchmarks import payloads
+from haaslib import api
+from haaslib.domain import HaaslibExcpetion
+from haaslib.model import (
+    PaginatedResponse,
+    UserLabBacktestResult,
+    UserLabBacktestSummaryResult,
+)
+
+SUMMARY_PAGE = PaginatedResponse[UserLabBacktestSummaryResult]
+
+
+def page_body(indent=None, leading=False) -> bytes:
+    page = payloads.backtest_page(5, next_page_id=5, heavy_points=4)
+    if leading:
+        page = {"NP": page["NP"], "I": page["I"]}
+    return json.dumps(payloads.api_response(page), indent=indent).encode()
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("leading", [False, True])
+def test_heavy_fields_are_loaded_on_access(indent, leading):
+    content = page_body(indent, leading)
+    full = api.parse_api_response(PaginatedResponse[UserLabBacktestResult], content)
+    summary = api.parse_api_response(SUMMARY_PAGE, content)
+
+    assert summary.data is not None and full.data is not None
+    assert summary.data.next_page_id == full.data.next_page_id == 5
+    for backtest, expected in zip(summary.data.items, full.data.items, strict=True):
+        assert backtest.backtest_id == expected.backtest_id
+        assert backtest.runtime == expected.runtime
+        assert (backtest.chart, backtest.logs) == (expected.chart, expected.logs)
+
+
+def test_pickled_backtest_keeps_heavy_fields():
+    summary = api.parse_api_response(SUMMARY_PAGE, page_body())
+    assert summary.data is not None
+
+    items = pickle.loads(pickle.dumps(summary.data.items))
+
+    assert items == summary.data.items
+    assert items[-1].logs == summary.data.items[-1].logs
+
+
+def test_equality_ignores_raw_page():
+    content = page_body()
+    first = api.parse_api_response(SUMMARY_PAGE, content).data
+    second = api.parse_api_response(SUMMARY_PAGE, content.replace(b", ", b",")).data
+
+    assert first == second
+
+
+def test_heavy_fields_require_raw_page():
+    raw = payloads.backtest_result(0, "lab-0", heavy_points=1)
+    backtest = UserLabBacktestSummaryResult.model_validate(raw)
+
+    with pytest.raises(HaaslibExcpetion):
+        backtest.runtime
+
+
+def test_error_response():
+    content = json.dumps(payloads.api_response(None, False, "boom")).encode()
+
+    resp = api.parse_api_response(SUMMARY_PAGE, content)
+
+    assert (resp.success, resp.error, resp.data) == (False, "boom", None)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b'{"Success": true, "Error": "", "Data": {"I": [], "NP": -1}} []',
+        b'{"Success": true, "Error": "", "Data": {"I": [] "NP": -1}}',
+        b'{"Success": true, "Error": "", "Data": {"I": [], "NP": -1,}}',
+    ],
+)
+def test_malformed_page(content):
+    with pytest.raises(ValueError):
+        api.parse_api_response(SUMMARY_PAGE, content)
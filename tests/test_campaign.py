@@ -0,0 +1,94 @@
+from typing import Any, Optional
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from haaslib import api
+from haaslib.api import Guest, HaasApiError, RequestsExecutor
+from haaslib.campaign import LabCampaign, LabCampaignResult, LabSpec
+from haaslib.domain import BacktestPeriod, MarketTag
+from haaslib.lab import ChangeHaasScriptParameterRequest
+from haaslib.model import CreateLabRequest
+
+
+class FailingExecutor:
+    """
+    Fails the first `failures` requests of the channel.
+    """
+
+    def __init__(self, executor: Any, channel: str, error: Exception, failures=1):
+        self.executor = executor
+        self.channel = channel
+        self.error = error
+        self.failures = failures
+
+    def execute(self, endpoint, response_type, query_params: Optional[dict] = None):
+        if (query_params or {}).get("channel") == self.channel and self.failures:
+            self.failures -= 1
+            raise self.error
+        return self.executor.execute(endpoint, response_type, query_params)
+
+
+@pytest.fixture
+def executor():
+    with StubServer(backtests=10, heavy_points=1) as server:
+        yield RequestsExecutor(
+            host=server.host, port=server.port, state=Guest()
+        ).authenticate("test@example.com", "password")
+
+
+def spec(*params: ChangeHaasScriptParameterRequest) -> LabSpec:
+    return LabSpec(
+        lab=CreateLabRequest(
+            script_id="script-0",
+            name="test",
+            account_id="account-0",
+            market=MarketTag("BINANCE_BTC_USDT_"),
+            interval=15,
+            default_price_data_style="CandleStick",
+        ),
+        period=BacktestPeriod(BacktestPeriod.Type.DAY, 1),
+        params=list(params),
+    )
+
+
+def run(executor: Any, specs: list[LabSpec]) -> list[LabCampaignResult]:
+    results: list[LabCampaignResult] = []
+    LabCampaign(
+        executor,
+        results.append,
+        concurrency=2,
+        delete_finished=True,
+        min_poll_interval=0.01,
+        max_poll_interval=0.05,
+    ).run(specs)
+    return results
+
+
+def test_not_started_lab_is_deleted(executor):
+    unknown = ChangeHaasScriptParameterRequest("Unknown parameter", [])
+
+    results = run(executor, [spec(), spec(unknown), spec()])
+
+    assert sorted(r.ok for r in results) == [False, True, True]
+    assert isinstance(next(r for r in results if not r.ok).error, ValueError)
+    assert api.get_all_labs(executor) == []
+
+
+def test_labs_poll_error_is_retried(executor):
+    failing = FailingExecutor(executor, "GET_LABS", ConnectionError("reset"))
+
+    results = run(failing, [spec(), spec()])
+
+    assert failing.failures == 0
+    assert [r.ok for r in results] == [True, True]
+    assert all(len(r.backtests) == 10 for r in results)
+
+
+def test_lab_details_error_fails_only_its_lab(executor):
+    failing = FailingExecutor(executor, "GET_LAB_DETAILS", HaasApiError("boom"))
+
+    results = run(failing, [spec(), spec(), spec()])
+
+    assert sorted(r.ok for r in results) == [False, True, True]
+    assert str(next(r for r in results if not r.ok).error) == "boom"
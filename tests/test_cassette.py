@@ -0,0 +1,126 @@
+import warnings
+
+import pytest
+
+from benchmarks.stub_server import StubServer
+from haaslib import api
+from haaslib.api import Guest, HaasApiError, RequestsExecutor
+from haaslib.cassette import CassetteExecutor, CassetteMissError
+from haaslib.model import (
+    GetBacktestResultRequest,
+    StartLabExecutionRequest,
+    UserLabStatus,
+)
+
+
+class ParsedOnlyExecutor:
+    """
+    Executor without `execute_raw`, like other executor wrappers.
+    """
+
+    def __init__(self, executor):
+        self.executor = executor
+
+    def execute(self, endpoint, response_type, query_params=None):
+        return self.executor.execute(endpoint, response_type, query_params)
+
+
+@pytest.fixture
+def server():
+    with StubServer(backtests=5, heavy_points=2) as server:
+        yield server
+
+
+@pytest.fixture
+def executor(server):
+    return RequestsExecutor(
+        host=server.host, port=server.port, state=Guest()
+    ).authenticate("test@example.com", "password")
+
+
+@pytest.fixture
+def req(server) -> GetBacktestResultRequest:
+    (lab_id,) = server.add_labs(1)
+    return GetBacktestResultRequest(lab_id=lab_id, next_page_id=0, page_lenght=5)
+
+
+def test_raw_response_is_replayed_for_any_response_type(executor, req, tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    with CassetteExecutor(path, executor, mode="record") as cassette:
+        api.get_backtest_result(cassette, req, summary_only=True)
+
+    replay = CassetteExecutor(path)
+    page = api.get_backtest_result(replay, req)
+
+    assert page.items == api.get_backtest_result(executor, req).items
+    assert page.items[0].runtime is not None
+
+
+def test_recorded_error_is_replayed(executor, tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    with CassetteExecutor(path, executor, mode="record") as cassette:
+        with pytest.raises(HaasApiError) as recorded:
+            api.get_lab_details(cassette, "missing")
+
+    with pytest.raises(HaasApiError) as replayed:
+        api.get_lab_details(CassetteExecutor(path), "missing")
+
+    assert str(replayed.value) == str(recorded.value)
+
+
+def test_parsed_response_is_replayed_only_for_its_type(executor, req, tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    with CassetteExecutor(
+        path, ParsedOnlyExecutor(executor), mode="record"
+    ) as cassette:
+        summary = api.get_backtest_result(cassette, req, summary_only=True)
+
+    replay = CassetteExecutor(path)
+    assert api.get_backtest_result(replay, req, summary_only=True) == summary
+    with pytest.raises(CassetteMissError):
+        api.get_backtest_result(replay, req)
+
+
+def test_save_closes_file(executor, tmp_path):
+    cassette = CassetteExecutor(tmp_path / "cassette.jsonl.gz", executor, "record")
+    api.get_all_bots(cassette)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        cassette.save()
+
+    assert api.get_all_bots(CassetteExecutor(cassette.path))
+
+
+def test_record_replaces_cassette(server, executor, tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    (lab_id,) = server.add_labs(1, status=0)
+
+    with CassetteExecutor(path, executor, mode="record") as cassette:
+        api.get_lab_details(cassette, lab_id)
+    api.start_lab_execution(
+        executor,
+        StartLabExecutionRequest(
+            lab_id=lab_id, start_unix=0, end_unix=1, send_email=False
+        ),
+    )
+    with CassetteExecutor(path, executor, mode="record") as cassette:
+        api.get_lab_details(cassette, lab_id)
+
+    replay = CassetteExecutor(path)
+    assert api.get_lab_details(replay, lab_id).status == UserLabStatus.COMPLETED
+    with pytest.raises(CassetteMissError):
+        api.get_all_bots(replay)
+
+
+def test_auto_adds_to_cassette(executor, tmp_path):
+    path = tmp_path / "cassette.jsonl.gz"
+    with CassetteExecutor(path, executor, mode="record") as cassette:
+        api.get_all_bots(cassette)
+    with CassetteExecutor(path, executor, mode="auto") as cassette:
+        api.get_all_bots(cassette)
+        api.get_all_labs(cassette)
+
+    replay = CassetteExecutor(path)
+    assert api.get_all_bots(replay) == api.get_all_bots(executor)
+    assert api.get_all_labs(replay) == []
@@ -0,0 +1,51 @@
+import json
+from typing import Optional
+
+import pytest
+from pydantic import ValidationError
+
+from benchmarks import payloads
+from haaslib.fleet import BotFleet
+
+
+class BotsExecutor:
+    def __init__(self, bots: list[dict]):
+        self.bots = bots
+
+    def execute_raw(self, endpoint, query_params: Optional[dict] = None) -> bytes:
+        return json.dumps(payloads.api_response(self.bots)).encode()
+
+
+def test_unchanged_response_is_skipped():
+    executor = BotsExecutor(payloads.bots(2))
+    fleet = BotFleet(executor)  # type: ignore
+
+    assert [event.kind for event in fleet.refresh()] == ["added", "added"]
+    assert fleet.refresh() == []
+
+    executor.bots = [payloads.bot(0, update_counter=1)]
+    events = fleet.refresh()
+
+    assert [(event.kind, event.bot.bot_id) for event in events] == [
+        ("changed", "bot-0"),
+        ("removed", "bot-1"),
+    ]
+
+
+def test_failed_response_is_applied_again():
+    executor = BotsExecutor(payloads.bots(1))
+    fleet = BotFleet(executor)  # type: ignore
+    fleet.refresh()
+
+    executor.bots = [payloads.bot(0, update_counter=99), {"ID": "bot-1"}]
+    for _ in range(2):
+        with pytest.raises(ValidationError):
+            fleet.refresh()
+
+    bot = fleet.get("bot-0")
+    assert bot is not None and bot.update_counter == 0
+
+    executor.bots = executor.bots[:1]
+    (event,) = fleet.refresh()
+
+    assert (event.kind, event.bot.update_counter) == ("changed", 99)
@@ -0,0 +1,95 @@
+import pytest
+
+from benchmarks import payloads
+from haaslib.lab import (
+    ChangeHaasScriptParameterRequest,
+    ParameterIndex,
+    update_many_params,
+    update_params,
+)
+from haaslib.model import UserLabDetails, UserLabParameter
+
+KEYS = (
+    "1-1-10-15.Fast Length",
+    "2-2-10-15.Slow Length",
+    "3-3-10-15.Length",
+    "4-4-10-15.Stop-Loss %",
+    "5-5-10-15.Stop loss",
+    "6-6-10-15.RSI",
+    "7-7-10-15.rsi",
+)
+
+
+@pytest.mark.parametrize(
+    "name, key",
+    [
+        # Exact key wins over the case insensitive one
+        ("7-7-10-15.rsi", "7-7-10-15.rsi"),
+        ("6-6-10-15.RSI", "6-6-10-15.RSI"),
+        # Case insensitive key wins over normalized name
+        ("5-5-10-15.STOP LOSS", "5-5-10-15.Stop loss"),
+        # Normalized name wins over substring of other keys
+        ("length", "3-3-10-15.Length"),
+        # Substring is the last resort
+        ("fast", "1-1-10-15.Fast Length"),
+    ],
+)
+def test_name_precedence(name, key):
+    index = ParameterIndex(KEYS)
+
+    assert index.keys[index.find(name)] == key
+
+
+@pytest.mark.parametrize("name", ["Len", "rsi", "Stop loss"])
+def test_ambiguous_name(name):
+    with pytest.raises(ValueError, match="ambiguous"):
+        ParameterIndex(KEYS).find(name)
+
+
+def test_unknown_name():
+    with pytest.raises(ValueError, match="Failed to find"):
+        ParameterIndex(KEYS).find("Take profit")
+
+
+def parameters(keys=KEYS) -> list[UserLabParameter]:
+    return [
+        UserLabParameter(K=key, T=0, O=[1], I=True, IS=False)  # type: ignore
+        for key in keys
+    ]
+
+
+def test_update_params_copies_options():
+    settings = parameters()
+    options = [5, 10]
+
+    update_params(settings, [ChangeHaasScriptParameterRequest("fast", options)])
+    options.append(15)
+
+    assert settings[0].options == [5, 10]
+    assert [s.options for s in settings[1:]] == [[1]] * (len(KEYS) - 1)
+
+
+def test_update_many_params():
+    labs = [
+        UserLabDetails.model_validate(payloads.lab_details(f"lab-{idx}", params=5))
+        for idx in range(3)
+    ]
+    # Another layout, where the same name resolves to another position
+    labs[2].parameters = parameters(("1-1-10-20.Parameter 10", "9-9-10-20.Parameter 1"))
+
+    update_many_params(labs, [ChangeHaasScriptParameterRequest("Parameter 1", [2, 3])])
+
+    assert [d.parameters[1].options for d in labs] == [[2, 3]] * 3
+    assert labs[0].parameters[1].options is not labs[1].parameters[1].options
+    assert labs[2].parameters[0].options == [1]
+
+
+def test_update_many_params_ambiguous_name():
+    labs = [
+        UserLabDetails.model_validate(payloads.lab_details("lab-0", params=5)),
+        UserLabDetails.model_validate(payloads.lab_details("lab-1", params=5)),
+    ]
+    labs[1].parameters = parameters(("1-1-10-20.Parameter 1", "2-2-10-20.Parameter-1"))
+
+    with pytest.raises(ValueError, match="ambiguous"):
+        update_many_params(labs, [ChangeHaasScriptParameterRequest("Parameter 1", [])])
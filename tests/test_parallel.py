@@ -0,0 +1,145 @@
+import json
+from concurrent.futures import Executor, Future
+from typing import Optional
+
+import pytest
+
+from benchmarks import payloads
+from haaslib.parallel import BacktestPageParser, _peek_next_page_id
+
+
+def page_body(next_page_id: int, leading: bool) -> bytes:
+    page = payloads.backtest_page(60, next_page_id=next_page_id, heavy_points=1)
+    if leading:
+        page = {"NP": page["NP"], "I": page["I"]}
+    return json.dumps(payloads.api_response(page)).encode()
+
+
+@pytest.mark.parametrize("leading", [False, True])
+@pytest.mark.parametrize("next_page_id", [100, -1])
+def test_next_page_id_ignores_population_index(next_page_id, leading):
+    content = page_body(next_page_id, leading)
+
+    assert _peek_next_page_id(content) == next_page_id
+
+
+def test_next_page_id_is_unknown_without_page():
+    content = json.dumps(payloads.api_response(None, False, "boom")).encode()
+
+    assert _peek_next_page_id(content) is None
+
+
+class DeferredFuture(Future):
+    """Parses the page only when its result is requested"""
+
+    def __init__(self, fn, args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+
+    def result(self, timeout=None):
+        if not self.done() and self.set_running_or_notify_cancel():
+            try:
+                self.set_result(self.fn(*self.args))
+            except BaseException as e:
+                self.set_exception(e)
+        return super().result(timeout)
+
+
+class DeferredPool(Executor):
+    def __init__(self):
+        self.futures: list[DeferredFuture] = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = DeferredFuture(fn, args)
+        self.futures.append(future)
+        return future
+
+
+class PagesExecutor:
+    def __init__(self, pages: dict[int, tuple[int, int]], padding: int = 0):
+        """
+        :param pages: Backtests amount and next page id by page id
+        :param padding: Whitespace at the end of every response
+        """
+        self.pages = pages
+        self.padding = padding
+        self.requested: list[int] = []
+
+    def execute_raw(self, endpoint, query_params: Optional[dict] = None) -> bytes:
+        assert query_params is not None
+        page_id = query_params["nextpageid"]
+        self.requested.append(page_id)
+        count, next_page_id = self.pages[page_id]
+        page = payloads.backtest_page(
+            count, next_page_id=next_page_id, offset=page_id, heavy_points=1
+        )
+        content = json.dumps(payloads.api_response(page)).encode()
+        return content + b" " * self.padding
+
+
+def pool_parser(prefetch: int = 2) -> tuple[BacktestPageParser, DeferredPool]:
+    parser = BacktestPageParser(max_workers=8, min_pool_size=0, prefetch=prefetch)
+    pool = parser._pool = DeferredPool()
+    return parser, pool
+
+
+@pytest.mark.parametrize("prefetch", [0, 1, 2])
+def test_read_ahead_is_limited_by_prefetch(prefetch):
+    parser, _ = pool_parser(prefetch)
+    executor = PagesExecutor({i: (1, i + 1) for i in range(9)} | {9: (1, -1)})
+
+    pages = parser.iter_backtest_pages(executor, "lab-0")  # type: ignore
+    next(pages)
+    assert executor.requested == list(range(prefetch + 1))
+
+    assert sum(len(page.items) for page in pages) == 9
+    assert executor.requested == list(range(10))
+
+
+def test_pages_parsed_in_place_are_not_read_ahead():
+    parser = BacktestPageParser(max_workers=8, prefetch=2)
+    executor = PagesExecutor({0: (1, 1), 1: (1, -1)})
+
+    pages = parser.iter_backtest_pages(executor, "lab-0")  # type: ignore
+    next(pages)
+
+    assert executor.requested == [0]
+    assert [page.next_page_id for page in pages] == [-1]
+
+
+def test_wrong_guess_cancels_read_ahead():
+    parser, pool = pool_parser(prefetch=2)
+    # Empty page ends pagination whatever its next page id is
+    executor = PagesExecutor({0: (2, 2), 2: (0, 4), 4: (2, -1)})
+
+    pages = list(parser.iter_backtest_pages(executor, "lab-0"))  # type: ignore
+
+    assert [len(page.items) for page in pages] == [2, 0]
+    assert executor.requested == [0, 2, 4]
+    assert pool.futures[2].cancelled()
+
+
+def test_unknown_guess_is_corrected_by_parsed_page():
+    parser, _ = pool_parser(prefetch=2)
+    # Trailing whitespace hides next page id from the guess
+    executor = PagesExecutor({0: (2, 2), 2: (2, -1)}, padding=300)
+    assert _peek_next_page_id(executor.execute_raw("Labs", {"nextpageid": 0})) is None
+    executor.requested.clear()
+
+    pages = list(parser.iter_backtest_pages(executor, "lab-0"))  # type: ignore
+
+    assert [page.next_page_id for page in pages] == [2, -1]
+    assert executor.requested == [0, 2]
+
+
+def test_closed_iterator_cancels_pages_in_flight():
+    parser, pool = pool_parser(prefetch=2)
+    executor = PagesExecutor({0: (1, 1), 1: (1, 2), 2: (1, 3), 3: (1, -1)})
+
+    pages = parser.iter_backtest_pages(executor, "lab-0")  # type: ignore
+    next(pages)
+    pages.close()
+
+    assert executor.requested == [0, 1, 2]
+    assert [future.cancelled() for future in pool.futures] == [False, True, True]
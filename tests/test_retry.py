@@ -0,0 +1,100 @@
+from typing import Optional
+
+import pytest
+import requests
+
+from benchmarks.stub_server import StubServer
+from haaslib import api
+from haaslib.api import Guest, RequestsExecutor
+from haaslib.metrics import InMemoryMetrics, format_prometheus
+from haaslib.retry import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryingExecutor,
+    RetryPolicy,
+)
+from haaslib.throttle import ThrottlingExecutor
+
+
+class FlakyExecutor:
+    host = "flaky"
+
+    def __init__(self, failures: int):
+        self.failures = failures
+
+    def execute(self, endpoint, response_type, query_params: Optional[dict] = None):
+        if self.failures:
+            self.failures -= 1
+            raise requests.ConnectionError("reset")
+        return True
+
+
+def test_breaker_requires_host():
+    with pytest.raises(ValueError):
+        RetryingExecutor(ThrottlingExecutor(FlakyExecutor(0)))
+
+    executor = RetryingExecutor(ThrottlingExecutor(FlakyExecutor(0)), host="server")
+    assert executor.breaker is not None and executor.breaker.host == "server"
+
+
+def test_retries_are_reported_to_metrics():
+    metrics = InMemoryMetrics()
+    executor = RetryingExecutor(
+        FlakyExecutor(2),
+        breaker=CircuitBreaker("flaky", failure_threshold=5),
+        metrics=metrics,
+        sleep=lambda _: None,
+    )
+
+    assert executor.execute("Labs", bool, {"channel": "GET_LABS"}) is True
+
+    series = metrics.snapshot()[("Labs", "GET_LABS")]
+    assert series.retries == executor.stats.retries == 2
+    assert series.breaker_state == "closed"
+    assert 'haaslib_request_retries_total{endpoint="Labs",channel="GET_LABS"} 2' in (
+        format_prometheus(metrics.snapshot())
+    )
+
+
+def test_short_circuit_is_reported_to_metrics():
+    metrics = InMemoryMetrics()
+    executor = RetryingExecutor(
+        FlakyExecutor(10),
+        breaker=CircuitBreaker("flaky", failure_threshold=1),
+        metrics=metrics,
+        sleep=lambda _: None,
+    )
+
+    # The first failure opens the circuit, so the retry isn't sent
+    with pytest.raises(CircuitOpenError):
+        executor.execute("Labs", bool, {"channel": "GET_LABS"})
+
+    series = metrics.snapshot()[("Labs", "GET_LABS")]
+    assert (series.retries, series.short_circuited) == (1, 1)
+    assert series.breaker_state == "open"
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.ChunkedEncodingError("reset"),
+        requests.exceptions.ContentDecodingError("truncated"),
+    ],
+)
+def test_body_read_errors_are_transient(error):
+    assert RetryPolicy().is_transient(error)
+
+
+def test_connection_reset_while_reading_body_is_retried():
+    with StubServer(bots=200) as server:
+        executor = RequestsExecutor(
+            host=server.host, port=server.port, state=Guest()
+        ).authenticate("test@example.com", "password")
+        server.resets["GET_BOTS"] = 2
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            api.get_all_bots(executor)
+
+        retrying = RetryingExecutor(executor, sleep=lambda _: None)
+        assert len(api.get_all_bots(retrying)) == 200
+        assert retrying.stats.retries == 1